@@ -1,22 +1,51 @@
+# Açılış profili: MDASH_PROFILE_STARTUP=1 ile import ve ilk layout süreleri raporlanır
+from services.startup import StartupProfile
+startup = StartupProfile.from_env()
+
 import dash
-from dash import dcc, html, Input, Output, State, clientside_callback
+from dash import dcc, html, Input, Output, State, Patch, clientside_callback
 import dash_bootstrap_components as dbc
 import pandas as pd
 from datetime import date
 from dash.exceptions import PreventUpdate
 from dash_bootstrap_templates import load_figure_template
-import base64, io
+import io, os
+startup.mark("dash/plotly/pandas import")
 
 from components.layout import main_layout
+startup.mark("components.layout import")
 from components.charts import (
     sales_trend_chart,
     top_stock_chart,
     cash_vs_expense_pie,
     segment_scatter,
     profit_scatter,
-    sales_year_comparison_chart
+    sales_year_comparison_chart,
+    customer_profit_summary,
+    profit_threshold_traces,
+    profit_points,
+    profit_trace_offset,
+    PROFIT_LINE_TRACE,
+    PROFIT_BELOW_TRACE,
 )
+startup.mark("components.charts import")
 from components.kpi_cards import generate_kpi_cards
+from services.columnar_cache import ColumnarCache
+from services.dataset import Dataset
+from services.figure_cache import FigureCache
+from services.figure_encoding import encode_trace
+from services.ingest import ingest_upload, iter_base64_chunks
+from services.loader import SchemaError, load_csv
+from services.lru import LRUCache
+from services.metrics import CallbackMetrics, add_rows, stage
+from services.registry import DatasetRegistry
+from services.search import SearchIndex, search_option
+startup.mark("components/services import")
+
+# Veri ve önbellek yolları çalışma dizininden bağımsız: app.py'nin bulunduğu dizine göre
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
 
 app = dash.Dash(
     __name__,
@@ -30,17 +59,134 @@ app = dash.Dash(
     meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}]
 )
 server = app.server
+# Copy-on-write: filtre dilimleri paylaşılan veri setinin salt okunur görünümleri olur;
+# builder'lar dilime yazarsa sadece o dilim kopyalanır, savunma amaçlı .copy() gerekmez
+pd.set_option("mode.copy_on_write", True)
 load_figure_template(["bootstrap", "bootstrap_dark"])
+startup.mark("Dash uygulaması")
+
+# Temizlenmiş veri setleri içerik hash'ine göre Feather olarak önbelleklenir; dizin
+# MDASH_CACHE_MB'ı aşınca en uzun süredir okunmayan dosyalar silinir
+columnar_cache = ColumnarCache.from_env(default_dir=CACHE_DIR)
+
+# Dummy veri: gunicorn preload_app ile master süreçte bir kez yüklenir; worker'lar satırları,
+# küpü ve indeksleri fork sonrası kopyasız paylaşır (gunicorn.conf.py)
+with open(os.path.join(DATA_DIR, "mikro_dummy_data.csv"), "rb") as f:
+    global_bytes = f.read()
+global_key = ColumnarCache.key_for(global_bytes, ".csv")
+df_global = columnar_cache.load(global_key)
+if df_global is None:
+    # Şema doğrulama, sütun adı normalizasyonu ve tipler tek yerde: services.loader
+    df_global = load_csv(io.BytesIO(global_bytes))
+    dataset_global = Dataset.from_frame(df_global)
+    columnar_cache.store(global_key, dataset_global.frame)
+else:
+    dataset_global = Dataset.from_frame(df_global)
+del global_bytes
+startup.mark("temel veri seti")
+
+# Büyük yüklemeler istek worker'ını bloklamasın diye disk tabanlı kuyrukta arka planda işlenir
+# (diskcache kurulu değilse ya da MDASH_BACKGROUND_UPLOADS=0 ise senkron çalışır)
+def make_background_manager(cache_dir):
+    if os.environ.get("MDASH_BACKGROUND_UPLOADS", "1") == "0":
+        return None
+    try:
+        import diskcache
+    except ImportError:
+        return None
+    return dash.DiskcacheManager(diskcache.Cache(cache_dir))
+
+background_manager = make_background_manager(os.environ.get("MDASH_JOB_DIR", os.path.join(CACHE_DIR, "jobs")))
+
+# Yüklenen veri setleri sunucuda tutulur, Store'da sadece token taşınır. Veri setleri spill
+# dizinine Feather olarak da yazılır: arka plan işleri ve diğer gunicorn worker'ları token'ı
+# dosyayı belleğe eşleyerek açar, yeniden parse etmez ve sayfa önbelleğini paylaşır.
+# Spill dizini MDASH_SPILL_MB'ı aşınca en uzun süredir açılmayan token'lar silinir.
+registry = DatasetRegistry.from_env(default_spill_dir=os.path.join(CACHE_DIR, "registry"))
+
+def get_dataset(token):
+    with stage("veri"):
+        dataset = registry.get(token) if token else None
+    return dataset if dataset is not None else dataset_global
+
+def get_profile(token):
+    # Tarih ve filtre meta verisi: satırlar (ya da spill dosyaları) yüklenmeden
+    with stage("veri"):
+        profile = registry.profile(token) if token else None
+    return profile if profile is not None else dataset_global.profile
+
+# Aynı veri + filtre + tema için figürler yeniden üretilmez
+figure_cache = FigureCache.from_env()
+
+# Callback ölçümleri (MDASH_METRICS=1): aşama süreleri, satır ve yanıt boyutu /metrics'te
+# Prometheus formatında; MDASH_SLOW_CALLBACK_MS eşiğini aşan çağrılar ayrıca loglanır
+metrics = CallbackMetrics.from_env()
+metrics.install(server, path=os.environ.get("MDASH_METRICS_PATH", "/metrics"), gauges=lambda: {
+    f"mdash_figure_cache_{name}": value for name, value in figure_cache.stats().items()
+})
+
+# Figürler temasız üretilir ve önbelleklenir: şablonu tarayıcı, switch'in o anki değerine
+# göre her figür geldiğinde uygular (aşağıdaki clientside callback). Sunucu, tarayıcının
+# localStorage'daki temasını bilemez; ilk açılışta switch'ten okunan tema yarışa açıktır.
+def strip_theme(fig):
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)",
+                      plot_bgcolor="rgba(0,0,0,0)")
+    fig.layout.template = None
+    return fig
+
+def cached_figure(builder, dataset, filters, get_data, *args):
+    key = (builder.__name__, dataset.fingerprint, filters, args)
+
+    def build():
+        data = get_data()
+        add_rows(len(data))
+        with stage("figür"):
+            fig = builder(data, *args)
+        with stage("tema"):
+            return strip_theme(fig)
+    return figure_cache.get_or_build(key, build)
+
+def normalize_filters(start_date, end_date, segments, customers):
+    return (start_date, end_date, tuple(sorted(segments or ())), tuple(sorted(customers or ())))
+
+# Aynı filtre için ayrı grafik callback'leri filtrelemeyi bir kez yapar
+_filtered_cubes = LRUCache(max_entries=32)
+
+def filtered_cube(dataset, filters):
+    def build():
+        start_date, end_date, segments, customers = filters
+        # Filtreler ham satırlara değil, Tarih'e göre sıralı (gün, Müşteri, Segment) küpüne uygulanır
+        with stage("filtre"):
+            return dataset.filter_cube(pd.to_datetime(start_date), pd.to_datetime(end_date),
+                                       list(segments), list(customers))
+    return _filtered_cubes.get_or_build((dataset.fingerprint, filters), build)
+
+# Kâr scatter'ının müşteri özeti ve çizilen noktaları: eşik kaydırıcısının her adımı
+# müşteri toplamlarını ve baskın segmenti yeniden hesaplamaz, sadece eşik izlerini üretir
+_profit_points = LRUCache(max_entries=32)
+
+def filtered_profit_points(dataset, filters):
+    def build():
+        cube = filtered_cube(dataset, filters)
+        add_rows(len(cube))
+        with stage("toplama"):
+            return profit_points(customer_profit_summary(cube))
+    return _profit_points.get_or_build((dataset.fingerprint, filters), build)
+
+# Müşteri filtresinde gösterilen en fazla seçenek (layout'ta ve her arama yanıtında)
+CUSTOMER_OPTION_LIMIT = int(os.environ.get("MDASH_CUSTOMER_OPTIONS", "50"))
 
-# Dummy veri
-df_global = pd.read_csv("data/mikro_dummy_data.csv")
-df_global["Tarih"] = pd.to_datetime(df_global["Tarih"], errors="coerce")
-df_global["Satış"] = pd.to_numeric(df_global["Satış"], errors="coerce")
-df_global["Tahsilat"] = pd.to_numeric(df_global["Tahsilat"], errors="coerce")
-df_global["Gider"] = pd.to_numeric(df_global["Gider"], errors="coerce")
-df_global = df_global.dropna(subset=["Tarih", "Satış", "Tahsilat", "Gider"]).copy()
+_search_indexes = LRUCache(max_entries=8)
 
-app.layout = main_layout(df_global)
+def customer_search_index(profile):
+    # Veri seti başına bir kez, profildeki müşteri listesinden kurulur (satırlara dokunmaz)
+    return _search_indexes.get_or_build(profile.fingerprint, lambda: SearchIndex(profile.customers))
+
+app.layout = main_layout(dataset_global.profile, CUSTOMER_OPTION_LIMIT)
+startup.mark("ilk layout")
+
+THEMED_GRAPHS = ["sales-trend", "sales-year-comparison", "top-stock",
+                 "cash-expense", "segment-scatter", "profit-scatter"]
 
 # Tema switch
 clientside_callback(
@@ -70,106 +216,250 @@ clientside_callback(
     prevent_initial_call=False
 )
 
-# Dosya yükleme
-@app.callback(
-    Output("uploaded-data", "data"),
-    Output("upload-status", "children"),
-    Input("upload-data", "contents"),
-    State("upload-data", "filename"),
+# Figür şablonu tarayıcıda uygulanır: tema değişince ve sunucudan (ya da Patch ile) her
+# figür geldiğinde. Şablonu zaten güncel olan figürler için no_update döner; callback kendi
+# çıktısıyla yeniden tetiklenmez (aynı callback içinde girdi = çıktı döngüsü)
+clientside_callback(
+    """
+    function(isLight, ...args) {
+        const templates = args.pop();
+        const template = templates[isLight ? 'bootstrap' : 'bootstrap_dark'];
+        return args.map(fig => {
+            if (!fig || !fig.layout || fig.layout.template === template) {
+                return window.dash_clientside.no_update;
+            }
+            const layout = Object.assign({}, fig.layout, {template: template});
+            return Object.assign({}, fig, {layout: layout});
+        });
+    }
+    """,
+    [Output(graph_id, "figure", allow_duplicate=True) for graph_id in THEMED_GRAPHS],
+    Input("color-mode-switch", "value"),
+    [Input(graph_id, "figure") for graph_id in THEMED_GRAPHS],
+    State("figure-templates", "data"),
     prevent_initial_call=True
 )
-def parse_upload(contents, filename):
+
+def upload_progress_text(bytes_read, total_bytes, rows_accepted, rows_rejected):
+    percent = min(100, 100 * bytes_read / total_bytes) if total_bytes else 0
+    return (f"⏳ %{percent:.0f} · {bytes_read / 1024 ** 2:.1f} / {total_bytes / 1024 ** 2:.1f} MB işlendi"
+            f" · {rows_accepted:,} satır kabul, {rows_rejected:,} satır reddedildi")
+
+# Dosya yükleme
+if background_manager is not None:
+    upload_callback_options = dict(
+        background=True,
+        manager=background_manager,
+        progress=Output("upload-progress", "children"),
+        progress_default="",
+        cancel=[Input("upload-cancel", "n_clicks")],
+        running=[(Output("upload-cancel", "disabled"), False, True)],
+    )
+else:
+    upload_callback_options = {}
+
+def parse_upload(set_progress, contents, filename, append=False, dataset_token=None):
     if contents is None:
         raise PreventUpdate
-    content_type, content_string = contents.split(',')
-    decoded = base64.b64decode(content_string)
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in (".csv", ".xlsx"):
+        return None, "❌ Sadece CSV veya Excel dosyası yükleyebilirsiniz!"
     try:
-        if filename.endswith('.csv'):
-            df = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-        elif filename.endswith('.xlsx'):
-            df = pd.read_excel(io.BytesIO(decoded))
+        # Aynı dosya daha önce yüklendiyse metin parse etmeden önbellekten oku;
+        # hash base64 parça parça çözülerek hesaplanır, dosya bütün halde bellekte tutulmaz
+        cache_key = ColumnarCache.key_for(iter_base64_chunks(contents), extension)
+        cached = columnar_cache.load(cache_key)
+        if cached is not None:
+            dataset = Dataset.from_frame(cached)
+            status = f"✅ {filename} yüklendi"
         else:
-            return None, "❌ Sadece CSV veya Excel dosyası yükleyebilirsiniz!"
-        if "Tarih" not in df.columns:
-            return None, "❌ Dosyada 'Tarih' sütunu eksik!"
-        df["Tarih"] = pd.to_datetime(df["Tarih"], errors="coerce")
-        df["Satış"] = pd.to_numeric(df["Satış"], errors="coerce")
-        df["Tahsilat"] = pd.to_numeric(df["Tahsilat"], errors="coerce")
-        df["Gider"] = pd.to_numeric(df["Gider"], errors="coerce")
-        df = df.dropna(subset=["Tarih", "Satış", "Tahsilat", "Gider"]).copy()
-        return df.to_json(date_format="iso", orient="split"), f"✅ {filename} yüklendi"
+            progress = None
+            if set_progress is not None:
+                progress = lambda *counts: set_progress(upload_progress_text(*counts))
+            result = ingest_upload(contents, extension, progress=progress)
+            if result.frame.empty:
+                return None, "❌ Dosyada geçerli satır bulunamadı!"
+            dataset = Dataset.from_frame(result.frame)
+            columnar_cache.store(cache_key, dataset.frame)
+            status = (f"✅ {filename} yüklendi: {result.rows_accepted:,} satır"
+                      f" ({result.rows_rejected:,} geçersiz satır atlandı,"
+                      f" tahmini çerçeve belleği ~{result.peak_frame_bytes / 1024 ** 2:.2f} MB)")
+
+        # Ekleme modu: yeni dönem mevcut yüklenmiş veriye işlenir, (Tarih, Müşteri) çakışanlar güncellenir
+        base = registry.get(dataset_token) if append and dataset_token else None
+        if base is not None:
+            dataset, replaced, duplicates = base.append(dataset)
+            status += (f" · mevcut veriye eklendi ({replaced:,} satır güncellendi,"
+                       f" dosyadaki {duplicates:,} tekrar satır atıldı, toplam {len(dataset.frame):,} satır)")
+        status += f" · {dataset.bytes_per_row:.0f} B/satır"
+        return registry.put(dataset, persist=True), status
+    except SchemaError as e:
+        return None, f"❌ {e}"
     except Exception as e:
         return None, f"❌ Hata: {str(e)}"
 
-# Dashboard callback
 @app.callback(
-    [
-        Output("sales-year-comparison", "figure"),
-        Output("top-stock", "figure"),
-        Output("cash-expense", "figure"),
-        Output("segment-scatter", "figure"),
-        Output("profit-scatter", "figure"),
-        Output("kpi-cards", "children"),
-    ],
-    [
-        Input("start-date", "date"),
-        Input("end-date", "date"),
-        Input("segment-filter", "value"),
-        Input("customer-filter", "value"),
-        Input("margin-threshold-slider", "value"),
-        Input("color-mode-switch", "value"),
-        Input("uploaded-data", "data")
-    ],
+    Output("uploaded-data", "data"),
+    Output("upload-status", "children"),
+    Input("upload-data", "contents"),
+    State("upload-data", "filename"),
+    State("upload-append", "value"),
+    State("uploaded-data", "data"),
+    prevent_initial_call=True,
+    **upload_callback_options
+)
+def upload_callback(*args):
+    # Arka plan modunda Dash ilk argüman olarak set_progress fonksiyonunu verir
+    if background_manager is None:
+        args = (None,) + args
+    return parse_upload(*args)
+
+# Dashboard callback'leri: her grafik sadece kullandığı girdilere bağlıdır ve
+# filtrelenmiş küp tüm grafikler arasında paylaşılır (filtered_cube)
+DASHBOARD_FILTERS = [
+    Input("start-date", "date"),
+    Input("end-date", "date"),
+    Input("segment-filter", "value"),
+    Input("customer-filter", "value"),
+    Input("uploaded-data", "data"),
+]
+
+def dashboard_figure(builder, filter_values, dataset_token, *args):
+    dataset = get_dataset(dataset_token)
+    if dataset.cube.empty:
+        raise PreventUpdate
+    filters = normalize_filters(*filter_values)
+    return cached_figure(builder, dataset, filters,
+                         lambda: filtered_cube(dataset, filters), *args)
+
+@app.callback(
+    Output("sales-year-comparison", "figure"),
+    DASHBOARD_FILTERS,
+    prevent_initial_call=False
+)
+@metrics.instrument
+def update_sales_year_comparison(start_date, end_date, selected_segments, selected_customers,
+                                 dataset_token):
+    return dashboard_figure(sales_year_comparison_chart,
+                            (start_date, end_date, selected_segments, selected_customers),
+                            dataset_token)
+
+@app.callback(
+    Output("top-stock", "figure"),
+    DASHBOARD_FILTERS,
+    prevent_initial_call=False
+)
+@metrics.instrument
+def update_top_stock(start_date, end_date, selected_segments, selected_customers,
+                     dataset_token):
+    return dashboard_figure(top_stock_chart,
+                            (start_date, end_date, selected_segments, selected_customers),
+                            dataset_token)
+
+@app.callback(
+    Output("cash-expense", "figure"),
+    DASHBOARD_FILTERS,
+    prevent_initial_call=False
+)
+@metrics.instrument
+def update_cash_expense(start_date, end_date, selected_segments, selected_customers,
+                        dataset_token):
+    return dashboard_figure(cash_vs_expense_pie,
+                            (start_date, end_date, selected_segments, selected_customers),
+                            dataset_token)
+
+@app.callback(
+    Output("segment-scatter", "figure"),
+    DASHBOARD_FILTERS,
+    prevent_initial_call=False
+)
+@metrics.instrument
+def update_segment_scatter(start_date, end_date, selected_segments, selected_customers,
+                           dataset_token):
+    return dashboard_figure(segment_scatter,
+                            (start_date, end_date, selected_segments, selected_customers),
+                            dataset_token)
+
+@app.callback(
+    Output("kpi-cards", "children"),
+    DASHBOARD_FILTERS,
     prevent_initial_call=False
 )
-def update_dashboard(start_date, end_date, selected_segments, selected_customers,
-                     threshold_percent, is_light, uploaded_json):
-    df = pd.read_json(uploaded_json, orient="split") if uploaded_json else df_global.copy()
-    if df.empty or "Tarih" not in df.columns:
+@metrics.instrument
+def update_kpi_cards(start_date, end_date, selected_segments, selected_customers, dataset_token):
+    dataset = get_dataset(dataset_token)
+    if dataset.cube.empty:
         raise PreventUpdate
-    df["Tarih"] = pd.to_datetime(df["Tarih"], errors="coerce")
-    df = df.dropna(subset=["Tarih"]).copy()
-    if df.empty:
+    filters = normalize_filters(start_date, end_date, selected_segments, selected_customers)
+    cube = filtered_cube(dataset, filters)
+    add_rows(len(cube))
+    with stage("toplama"):
+        return generate_kpi_cards(cube)
+
+def threshold_ratio(threshold_percent):
+    return threshold_percent / 100 if threshold_percent else 0.10
+
+# Kâr scatter'ı filtre değişince baştan üretilir; eşik sadece State olarak okunur
+@app.callback(
+    Output("profit-scatter", "figure"),
+    DASHBOARD_FILTERS,
+    State("margin-threshold-slider", "value"),
+    prevent_initial_call=False
+)
+@metrics.instrument
+def update_profit_scatter(start_date, end_date, selected_segments, selected_customers,
+                          dataset_token, threshold_percent):
+    return dashboard_figure(profit_scatter,
+                            (start_date, end_date, selected_segments, selected_customers),
+                            dataset_token, threshold_ratio(threshold_percent))
+
+# Eşik kaydırıcısı: sadece eşik çizgisi ve eşik altı izleri Patch ile güncellenir
+@app.callback(
+    Output("profit-scatter", "figure", allow_duplicate=True),
+    Input("margin-threshold-slider", "value"),
+    [State("start-date", "date"),
+     State("end-date", "date"),
+     State("segment-filter", "value"),
+     State("customer-filter", "value"),
+     State("uploaded-data", "data")],
+    prevent_initial_call=True
+)
+@metrics.instrument
+def update_profit_threshold(threshold_percent, start_date, end_date, selected_segments,
+                            selected_customers, dataset_token):
+    dataset = get_dataset(dataset_token)
+    if dataset.cube.empty:
         raise PreventUpdate
-    start_date = pd.to_datetime(start_date)
-    end_date = pd.to_datetime(end_date)
-    mask = (df["Tarih"] >= start_date) & (df["Tarih"] <= end_date)
-    if selected_segments:
-        mask &= df["Segment"].isin(selected_segments)
-    if selected_customers:
-        mask &= df["Müşteri"].isin(selected_customers)
-    df_filtered = df[mask]
-    template = "bootstrap" if is_light else "bootstrap_dark"
-
-    fig1 = sales_year_comparison_chart(df_filtered)
-    fig2 = top_stock_chart(df_filtered)
-    fig3 = cash_vs_expense_pie(df_filtered)
-    fig4 = segment_scatter(df_filtered)
-    fig5 = profit_scatter(df_filtered, threshold=threshold_percent / 100 if threshold_percent else 0.10)
-
-    for fig in [fig1, fig2, fig3, fig4, fig5]:
-        fig.update_layout(template=template,
-                          paper_bgcolor="rgba(0,0,0,0)",
-                          plot_bgcolor="rgba(0,0,0,0)")
-
-    return fig1, fig2, fig3, fig4, fig5, generate_kpi_cards(df_filtered)
+    filters = normalize_filters(start_date, end_date, selected_segments, selected_customers)
+    points, density = filtered_profit_points(dataset, filters)
+    with stage("figür"):
+        line, below = profit_threshold_traces(points, threshold_ratio(threshold_percent))
+    offset = profit_trace_offset(density)
+    patched = Patch()
+    patched["data"][PROFIT_LINE_TRACE + offset].update(line)
+    if figure_cache.encode:
+        below = encode_trace(below)
+    patched["data"][PROFIT_BELOW_TRACE + offset].update(below)
+    return patched
 
 # Satış trend callback
 @app.callback(
     Output("sales-trend", "figure"),
     [Input("sales-trend-range", "value"),
-     Input("color-mode-switch", "value"),
      Input("uploaded-data", "data")],
     prevent_initial_call=False
 )
-def update_sales_trend(selected_range, is_light, uploaded_json):
-    df = pd.read_json(uploaded_json, orient="split") if uploaded_json else df_global.copy()
-    if df.empty or "Tarih" not in df.columns:
-        raise PreventUpdate
-    df["Tarih"] = pd.to_datetime(df["Tarih"], errors="coerce")
-    df = df.dropna(subset=["Tarih"]).copy()
-    if df.empty:
+@metrics.instrument
+def update_sales_trend(selected_range, dataset_token):
+    return sales_trend_figure(selected_range, dataset_token)
+
+def sales_trend_figure(selected_range, dataset_token):
+    dataset = get_dataset(dataset_token)
+    if dataset.cube.empty:
         raise PreventUpdate
+    if selected_range == "ALL":
+        # Tüm geçmiş: nokta bütçesi çözünürlüğü (gün -> hafta -> ay) ve LTTB'yi belirler
+        return cached_figure(sales_trend_chart, dataset, (None,), lambda: dataset.cube)
     today = pd.Timestamp.today()
     if selected_range == "1M":
         start_date = today - pd.DateOffset(months=1)
@@ -179,13 +469,11 @@ def update_sales_trend(selected_range, is_light, uploaded_json):
         start_date = today - pd.DateOffset(months=6)
     else:
         start_date = today - pd.DateOffset(years=1)
-    df_filtered = df[df["Tarih"] >= start_date]
-
-    fig = sales_trend_chart(df_filtered)
-    fig.update_layout(template="bootstrap" if is_light else "bootstrap_dark",
-                      paper_bgcolor="rgba(0,0,0,0)",
-                      plot_bgcolor="rgba(0,0,0,0)")
-    return fig
+    # Küp gün düzeyinde: başlangıcı bir sonraki gün başına yuvarlamak aynı satırları seçer
+    # ve aynı gün içindeki istekleri aynı önbellek anahtarına düşürür
+    start_date = start_date.ceil("D")
+    return cached_figure(sales_trend_chart, dataset, (start_date.isoformat(),),
+                         lambda: dataset.slice_cube(start=start_date))
 
 # Tarih butonları
 @app.callback(
@@ -197,18 +485,16 @@ def update_sales_trend(selected_range, is_light, uploaded_json):
      State("uploaded-data", "data")],
     prevent_initial_call=True
 )
-def manage_dates(today_clicks, last_clicks, reset_clicks, start_state, end_state, uploaded_json):
+@metrics.instrument
+def manage_dates(today_clicks, last_clicks, reset_clicks, start_state, end_state, dataset_token):
     ctx = dash.callback_context
     if not ctx.triggered:
         raise PreventUpdate
     trigger = ctx.triggered[0]["prop_id"].split(".")[0]
-    df = pd.read_json(uploaded_json, orient="split") if uploaded_json else df_global.copy()
-    if df.empty or "Tarih" not in df.columns:
+    profile = get_profile(dataset_token)
+    if profile.empty:
         raise PreventUpdate
-    df["Tarih"] = pd.to_datetime(df["Tarih"], errors="coerce")
-    df = df.dropna(subset=["Tarih"])
-    min_date = df["Tarih"].min().date()
-    max_date = df["Tarih"].max().date()
+    min_date, max_date = profile.start_date, profile.end_date
     if trigger == "reset-date-button":
         return min_date, max_date
     if trigger == "today-button":
@@ -217,17 +503,56 @@ def manage_dates(today_clicks, last_clicks, reset_clicks, start_state, end_state
         return start_state or min_date, max_date
     raise PreventUpdate
 
+# Müşteri arama: Dropdown'a yazılan metin sunucudaki önek/trigram indeksinde aranır
+@app.callback(
+    Output("customer-filter", "options"),
+    [Input("customer-filter", "search_value"),
+     Input("uploaded-data", "data")],
+    State("customer-filter", "value"),
+    prevent_initial_call=True
+)
+@metrics.instrument
+def update_customer_options(search_value, dataset_token, selected):
+    index = customer_search_index(get_profile(dataset_token))
+    with stage("filtre"):
+        matches = index.search(search_value, CUSTOMER_OPTION_LIMIT)
+    # Seçili müşteriler her zaman seçeneklerde kalır; yoksa Dropdown seçimi gösteremez
+    selected = list(selected or [])
+    chosen = set(selected)
+    return [search_option(c) for c in selected + [m for m in matches if m not in chosen]]
+
 # Filtre sıfırlama
 @app.callback(
     [Output("segment-filter", "value"), Output("customer-filter", "value")],
     Input("reset-filters-button", "n_clicks"),
     prevent_initial_call=True
 )
+@metrics.instrument
 def reset_filters(n_clicks):
     if n_clicks:
         return None, None
     raise PreventUpdate
 
+# İlk açılış: layout yer tutucularla gelir, ilk çizim callback'lerden yapılır. Varsayılan
+# durum (tüm tarih aralığı, filtre yok, %10 eşik, 3 ay trend) burada bir kez üretilir; figürler
+# temasız olduğundan her iki tema için de geçerlidir. gunicorn preload ile önbellek tüm
+# worker'lara kopyasız geçer.
+def prewarm_figures(dataset):
+    profile = dataset.profile
+    if profile.empty:
+        return
+    filter_values = (profile.start_date.isoformat(), profile.end_date.isoformat(), None, None)
+    for builder in (sales_year_comparison_chart, top_stock_chart, cash_vs_expense_pie, segment_scatter):
+        dashboard_figure(builder, filter_values, None)
+    dashboard_figure(profit_scatter, filter_values, None, threshold_ratio(10))
+    sales_trend_figure("3M", None)
+
+if os.environ.get("MDASH_PREWARM", "1") != "0":
+    prewarm_figures(dataset_global)
+    customer_search_index(dataset_global.profile)
+    startup.mark("ilk çizim (ön ısıtma)")
+startup.report()
+
 if __name__ == "__main__":
     print("Sunucu başlatılıyor...")
     app.run(debug=True, host="127.0.0.1", port=8050)
\ No newline at end of file
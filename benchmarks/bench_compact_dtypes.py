@@ -0,0 +1,56 @@
+"""Kompakt tiplerin (kategorik metinler, float32 Stok) satır başına bellek kazancı.
+
+Satır başına bellek float64/object gösterimle karşılaştırılır. Toplamların
+float64 sonuçlarla eşleştiği tests/test_compact_dtypes.py'de doğrulanır.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/bench_compact_dtypes.py --rows 1000000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.dataset import Dataset
+
+
+def make_rows(rows, customers, seed):
+    # Kuruşlu tutarlar, yüksek kardinaliteli müşteri adları
+    rng = np.random.default_rng(seed)
+    sales = (rng.lognormal(9, 1.2, rows) * 100).round() / 100
+    return pd.DataFrame({
+        "Tarih": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 4 * 365, rows), "D"),
+        "Müşteri": [f"Müşteri_{i}" for i in rng.integers(0, customers, rows)],
+        "Segment": rng.choice(["A", "B", "C", "D"], rows),
+        "Satış": sales,
+        "Tahsilat": (sales * rng.uniform(0.6, 1.0, rows)).round(2),
+        "Gider": (sales * rng.uniform(0.5, 1.0, rows)).round(2),
+        "Stok": rng.integers(0, 5000, rows).astype("float64"),
+    })
+
+
+def bytes_per_row(df):
+    return df.memory_usage(deep=True).sum() / len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--customers", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    raw = make_rows(args.rows, args.customers, args.seed)
+    dataset = Dataset.from_frame(raw)
+
+    print(f"{args.rows:,} satır")
+    print(f"float64/object satırlar : {bytes_per_row(raw):7.1f} B/satır")
+    print(f"kompakt satırlar        : {bytes_per_row(dataset.frame):7.1f} B/satır")
+    print(f"kompakt satırlar + küp  : {dataset.bytes_per_row:7.1f} B/satır")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Müşteri filtresi: layout'a gömülen seçenek boyutu ve sunucu tarafı arama süresi.
+
+Tüm müşterilerin Dropdown seçeneği olarak gönderildiği eski düzen, ilk limit
+seçenek + arama indeksiyle karşılaştırılır. Arama sorgularının en yavaşı
+--max-ms'i aşarsa çıkış kodu 1 olur. Türkçe katlama eşleşmeleri tests/test_search.py'de.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/bench_customer_search.py --customers 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from otomatikveritabanıolustur import customer_names
+from services.search import SearchIndex, search_option
+
+QUERIES = ["m", "mü", "müş", "MÜŞTERİ_0", "musteri_01", "000", "12345", "9999", "ist", "gıda", "yok"]
+
+
+def options_bytes(labels):
+    return len(json.dumps([search_option(c) for c in labels]).encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--max-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    labels = sorted(set(customer_names(args.customers)))
+    start = time.perf_counter()
+    index = SearchIndex(labels)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(labels):,} müşteri, indeks kurulumu {build_ms:.0f} ms")
+    print(f"   tüm seçenekler layout'ta : {options_bytes(labels) / 1024:9.1f} KB")
+    print(f"   ilk {args.limit} seçenek          : {options_bytes(labels[:args.limit]) / 1024:9.1f} KB")
+
+    slowest = 0.0
+    for query in QUERIES:
+        start = time.perf_counter()
+        found = index.search(query, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        slowest = max(slowest, elapsed)
+        print(f"   {query!r:16s} {len(found):4d} sonuç {elapsed:7.2f} ms")
+
+    if slowest > args.max_ms:
+        raise SystemExit(f"❌ En yavaş arama {slowest:.1f} ms > {args.max_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Baskın segment hesabı: eski groupby + lambda mode ile dominant_category süre karşılaştırması.
+
+Sonuçların birebir aynı olduğu tests/test_dominant_category.py'de doğrulanır.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/bench_dominant_category.py --rows 1000000 --customers 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.charts import dominant_category
+
+
+def make_rows(rows, customers, segments, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Müşteri": pd.Categorical([f"Müşteri_{i}" for i in rng.integers(0, customers, rows)]),
+        "Segment": pd.Categorical(rng.choice([chr(ord("A") + i) for i in range(segments)], rows)),
+    })
+
+
+def lambda_mode(df):
+    # profit_scatter'ın önceki hali
+    return df.groupby("Müşteri", observed=True).agg({
+        "Segment": lambda x: x.mode().iloc[0] if not x.mode().empty else "Bilinmiyor"
+    })["Segment"]
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--segments", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    df = make_rows(args.rows, args.customers, args.segments, args.seed)
+    old_time, _ = timed(lambda: lambda_mode(df), args.repeat)
+    new_time, _ = timed(lambda: dominant_category(df, "Müşteri", "Segment"), args.repeat)
+
+    print(f"{args.rows:,} satır, {args.customers:,} müşteri")
+    print(f"lambda mode       : {old_time * 1000:9.1f} ms")
+    print(f"dominant_category : {new_time * 1000:9.1f} ms")
+    print(f"hızlanma          : {old_time / new_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Grafik başına tarayıcıya giden figür JSON boyutu: düz JSON ve tipli dizi kodlaması.
+
+Her builder'ın çıktısı (uygulamadaki gibi temasız) iki biçimde serileştirilir
+ve boyutlar karşılaştırılır. Çözülen değerlerin hassasiyeti
+tests/test_figure_encoding.py'de doğrulanır.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/bench_figure_payload.py --rows 100000 --customers 20000
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from otomatikveritabanıolustur import generate
+from components.charts import (
+    sales_trend_chart,
+    top_stock_chart,
+    cash_vs_expense_pie,
+    segment_scatter,
+    profit_scatter,
+    sales_year_comparison_chart,
+)
+from services.dataset import Dataset
+from services.figure_encoding import encode_figure, payload_size
+
+BUILDERS = [sales_year_comparison_chart, top_stock_chart, cash_vs_expense_pie, segment_scatter, profit_scatter]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--customers", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    pd.set_option("mode.copy_on_write", True)
+    dataset = Dataset.from_frame(generate(rows=args.rows, customers=args.customers, seed=args.seed))
+    end = pd.Timestamp(dataset.cube_dates[-1])
+    figures = {builder.__name__: builder(dataset.cube) for builder in BUILDERS}
+    figures["sales_trend_chart"] = sales_trend_chart(
+        dataset.slice_cube(start=(end - pd.DateOffset(months=3)).ceil("D")))
+
+    total_plain = total_encoded = 0
+    print(f"{args.rows:,} satır, {args.customers:,} müşteri")
+    for name, fig in figures.items():
+        fig.layout.template = None     # uygulamadaki gibi temasız (şablon tarayıcıda uygulanır)
+        plain = fig.to_dict()
+        encoded = encode_figure(plain)
+        plain_bytes, encoded_bytes = payload_size(plain), payload_size(encoded)
+        total_plain += plain_bytes
+        total_encoded += encoded_bytes
+        print(f"   {name:30s} {plain_bytes / 1024:9.1f} KB -> {encoded_bytes / 1024:8.1f} KB"
+              f"  (%{100 * encoded_bytes / plain_bytes:5.1f})")
+    print(f"   {'toplam':30s} {total_plain / 1024:9.1f} KB -> {total_encoded / 1024:8.1f} KB"
+          f"  (%{100 * total_encoded / total_plain:5.1f})")
+
+
+if __name__ == "__main__":
+    main()
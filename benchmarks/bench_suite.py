@@ -0,0 +1,166 @@
+"""Callback ve grafik builder'ları için ölçeklenme benchmark'ı.
+
+Her veri boyutu için otomatikveritabanıolustur.generate ile deterministik veri
+üretilir; callback'lerin yaptığı işler (yükleme parse'ı, filtreleme, her builder
++ figür serileştirme, KPI kartları, satış trendi, eşik Patch'i) süre ve tepe bellek
+olarak ölçülür. Sonuçlar kayıtlı baseline ile karşılaştırılır: süre ya da bellek
+toleransı aşan veya veri özeti (satır sayısı, toplam satış) değişen her aşama
+çıkış kodu 1 ile raporlanır.
+
+Çalıştırma (proje kökünden):
+    python benchmarks/bench_suite.py                              # varsayılan boyutlar, baseline kontrolü
+    python benchmarks/bench_suite.py --sizes 10000,1000000,10000000
+    python benchmarks/bench_suite.py --update-baseline             # baseline'ı yeniden yaz
+
+Baseline süreleri makineye bağlıdır; referans makinede --update-baseline ile yenilenmelidir.
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from otomatikveritabanıolustur import generate
+from components.charts import (
+    sales_trend_chart,
+    top_stock_chart,
+    cash_vs_expense_pie,
+    segment_scatter,
+    profit_scatter,
+    sales_year_comparison_chart,
+    customer_profit_summary,
+    profit_points,
+    profit_threshold_traces,
+)
+from components.kpi_cards import generate_kpi_cards
+from services.dataset import Dataset
+from services.ingest import ingest_upload
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+BUILDERS = [top_stock_chart, cash_vs_expense_pie, segment_scatter, profit_scatter, sales_year_comparison_chart]
+
+
+def measure(func, repeat):
+    # Süre: izleme olmadan en iyi tekrar; bellek: tracemalloc altında tek çalıştırma
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"ms": round(best * 1000, 2), "peak_mb": round(peak / 2**20, 2)}, result
+
+
+def run_size(rows, args):
+    raw = generate(rows=rows, customers=max(8, rows // 200), segments=args.segments, seed=args.seed)
+    stages = {}
+
+    if rows <= args.upload_max_rows:
+        # parse_upload: base64 CSV -> akış halinde temizleme -> Dataset
+        contents = "data:text/csv;base64," + base64.b64encode(raw.to_csv(index=False).encode("utf-8")).decode()
+        stages["parse_upload"], dataset = measure(
+            lambda: Dataset.from_frame(ingest_upload(contents, ".csv").frame), args.repeat)
+        del contents
+    else:
+        stages["Dataset.from_frame"], dataset = measure(lambda: Dataset.from_frame(raw), args.repeat)
+    del raw
+
+    # Dashboard callback'leri: ortak filtreli küp + grafik başına builder ve serileştirme
+    end = pd.Timestamp(dataset.cube_dates[-1])
+    segments = sorted(dataset.cube["Segment"].cat.categories)[:max(1, args.segments // 2)]
+    stages["filter_cube"], cube = measure(
+        lambda: dataset.filter_cube(end - pd.DateOffset(years=2), end, segments, None), args.repeat)
+    for builder in BUILDERS:
+        stages[builder.__name__], _ = measure(lambda: builder(cube).to_dict(), args.repeat)
+    stages["generate_kpi_cards"], _ = measure(lambda: generate_kpi_cards(cube), args.repeat)
+
+    # update_sales_trend: son 3 ay dilimi + trend grafiği
+    trend_start = (end - pd.DateOffset(months=3)).ceil("D")
+    stages["update_sales_trend"], _ = measure(
+        lambda: sales_trend_chart(dataset.slice_cube(start=trend_start)).to_dict(), args.repeat)
+
+    # update_profit_threshold: eşik çizgisi ve eşik altı izleri
+    def threshold_patch():
+        points, _ = profit_points(customer_profit_summary(cube))
+        return profit_threshold_traces(points, 0.15)
+    stages["update_profit_threshold"], _ = measure(threshold_patch, args.repeat)
+
+    checksum = {"rows": int(len(dataset.frame)), "sales": round(float(dataset.cube["Satış"].sum()), 2)}
+    return {"stages": stages, "checksum": checksum}
+
+
+def compare(size, result, baseline, args):
+    failures = []
+    if baseline is None:
+        return failures
+    if result["checksum"] != baseline["checksum"]:
+        failures.append(f"{size}: veri özeti değişti {baseline['checksum']} -> {result['checksum']}")
+    for stage, current in result["stages"].items():
+        base = baseline["stages"].get(stage)
+        if base is None:
+            continue
+        # Küçük mutlak farklar (ölçüm gürültüsü) regresyon sayılmaz
+        if current["ms"] > base["ms"] * (1 + args.time_tolerance) and current["ms"] - base["ms"] > args.min_ms:
+            failures.append(f"{size} {stage}: {base['ms']} ms -> {current['ms']} ms")
+        if (current["peak_mb"] > base["peak_mb"] * (1 + args.memory_tolerance)
+                and current["peak_mb"] - base["peak_mb"] > args.min_mb):
+            failures.append(f"{size} {stage}: {base['peak_mb']} MB -> {current['peak_mb']} MB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000",
+                        help="virgülle ayrılmış satır sayıları (ör. 10000,1000000,10000000)")
+    parser.add_argument("--segments", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--upload-max-rows", type=int, default=1_000_000,
+                        help="bu boyuttan büyüklerde CSV yükleme yerine doğrudan Dataset kurulur")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--time-tolerance", type=float, default=1.0)
+    parser.add_argument("--memory-tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=10.0)
+    parser.add_argument("--min-mb", type=float, default=1.0)
+    args = parser.parse_args()
+
+    pd.set_option("mode.copy_on_write", True)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results, failures = {}, []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        result = results[str(size)] = run_size(size, args)
+        print(f"\n{size:,} satır (özet: {result['checksum']})")
+        for stage, values in result["stages"].items():
+            base = baseline.get(str(size), {}).get("stages", {}).get(stage)
+            ref = f"  (baseline {base['ms']:.1f} ms, {base['peak_mb']:.1f} MB)" if base else ""
+            print(f"   {stage:30s} {values['ms']:9.1f} ms {values['peak_mb']:8.1f} MB{ref}")
+        if not args.update_baseline:
+            failures += compare(size, result, baseline.get(str(size)), args)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"\nBaseline güncellendi: {args.baseline}")
+    elif failures:
+        raise SystemExit("❌ Performans regresyonu:\n   " + "\n   ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
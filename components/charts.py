@@ -3,36 +3,90 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-# Debug amaçlı: segmentleri görmek için
-df = pd.read_csv("data/mikro_dummy_data.csv")
-print(df["Segment"].unique())
-
-def sales_trend_chart(df):
-    df["Satış"] = pd.to_numeric(df["Satış"], errors="coerce")
-    df = df[df["Satış"] > 0]
-
-    df_grouped = df.groupby("Tarih")["Satış"].sum().reset_index()
+from services.cube import rollup, mean, ROW_COUNT
+from services.metrics import stage
+
+# Tüm grafikler ham satırlar yerine services.cube küpünü (gün, Müşteri, Segment) alır
+
+# Satış trendi: serinin gün sayısına göre bütçeye sığan en ince çözünürlük (gün -> hafta
+# -> ay), ay da sığmazsa LTTB ile seyreltilir. 1 yıla kadar günlük seri bütçeye sığar;
+# hafta/ay ve LTTB "Tümü" aralığında uzun geçmişte devreye girer
+TREND_FREQUENCIES = ["D", "W", "MS"]
+TREND_DAYS_PER_POINT = {"D": 1, "W": 7, "MS": 30}
+TREND_TITLES = {"D": "📈 Günlük Satış Trendleri", "W": "📈 Haftalık Satış Trendleri", "MS": "📈 Aylık Satış Trendleri"}
+TREND_AXIS_TITLES = {"D": "Tarih (Günler)", "W": "Tarih (Haftalar)", "MS": "Tarih (Aylar)"}
+TREND_POINT_BUDGET = 1500
+TREND_WEBGL_THRESHOLD = 500   # bu kadar noktadan sonra SVG spline yerine WebGL (Scattergl)
+
+
+def trend_granularity(span_days, point_budget=TREND_POINT_BUDGET):
+    for candidate in TREND_FREQUENCIES:
+        if span_days / TREND_DAYS_PER_POINT[candidate] <= point_budget:
+            return candidate
+    return TREND_FREQUENCIES[-1]
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: seriyi şeklini koruyarak n_out noktaya indirir."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)   # n_out - 2 iç kova
+    edges = np.append(edges, n)                             # son kova = son nokta
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2]
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax()) if end > start else a
+        selected[i + 1] = a
+    return selected
+
+
+def sales_trend_chart(cube, point_budget=TREND_POINT_BUDGET):
+    # Sadece pozitif satışlar: küpteki "Pozitif Satış" toplamı
+    with stage("toplama"):
+        daily = cube.groupby("Tarih")["Pozitif Satış"].sum()
+        daily = daily[daily > 0]
+        span_days = (daily.index[-1] - daily.index[0]).days + 1 if len(daily) else 0
+        freq = trend_granularity(span_days, point_budget)
+        series = daily if freq == "D" else daily.resample(freq).sum()
+        series = series[series > 0]
+        if len(series) > point_budget:
+            series = series.iloc[lttb_indices(series.index.asi8, series.to_numpy(), point_budget)]
+        df_grouped = series.rename("Satış").rename_axis("Tarih").reset_index()
+    webgl = len(df_grouped) > TREND_WEBGL_THRESHOLD
 
     fig = px.line(
         df_grouped,
         x="Tarih",
         y="Satış",
-        title="📈 Günlük Satış Trendleri",
-        line_shape="spline"
+        title=TREND_TITLES[freq],
+        # Scattergl spline desteklemez; çok noktada düz çizgi hem hızlı hem okunaklı
+        line_shape="linear" if webgl else "spline",
+        render_mode="webgl" if webgl else "svg"
     )
 
     fig.update_traces(
         hovertemplate="Tarih: %{x|%d %b %Y}<br>Satış: ₺%{y:,.0f}<extra></extra>"
     )
 
+    # Haftalık sabit işaretler sadece kısa aralıklarda; uzun aralıkta Plotly kendisi seçer
+    weekly_ticks = span_days <= 20 * 7
     fig.update_layout(
         xaxis=dict(
             tickformat="%d %b %Y",
             tickangle=45,
-            tickmode="linear",
-            dtick=604800000 # 7 gün = 7 * 24 * 60 * 60 * 1000 ms
+            tickmode="linear" if weekly_ticks else "auto",
+            dtick=604800000 if weekly_ticks else None # 7 gün = 7 * 24 * 60 * 60 * 1000 ms
         ),
-        xaxis_title="Tarih (Haftalar)",
+        xaxis_title=TREND_AXIS_TITLES[freq],
         yaxis_title="Satış (₺)",
         margin=dict(l=10, r=10, t=50, b=10)
     )
@@ -40,8 +94,9 @@ def sales_trend_chart(df):
     return fig
 
 
-def top_stock_chart(df, top_n=10):
-    t = df.groupby("Müşteri")["Stok"].sum().nlargest(top_n).reset_index()
+def top_stock_chart(cube, top_n=10):
+    with stage("toplama"):
+        t = cube.groupby("Müşteri", observed=True)["Stok"].sum().nlargest(top_n).reset_index()
     fig = px.bar(
         t,
         x="Müşteri",
@@ -56,9 +111,10 @@ def top_stock_chart(df, top_n=10):
     return fig
 
 
-def cash_vs_expense_pie(df):
-    sum_cashin = df["Tahsilat"].sum()
-    sum_expense = df["Gider"].sum()
+def cash_vs_expense_pie(cube):
+    with stage("toplama"):
+        sum_cashin = cube["Tahsilat"].sum()
+        sum_expense = cube["Gider"].sum()
     fig = go.Figure(
         go.Pie(
             labels=["Tahsilat", "Gider"],
@@ -72,8 +128,13 @@ def cash_vs_expense_pie(df):
     return fig
 
 
-def segment_scatter(df):
-    seg = df.groupby("Segment")[["Satış", "Tahsilat"]].mean().reset_index()
+def segment_scatter(cube):
+    with stage("toplama"):
+        rolled = rollup(cube, "Segment")
+        seg = pd.DataFrame({
+            "Satış": mean(rolled, "Satış"),
+            "Tahsilat": mean(rolled, "Tahsilat"),
+        }).reset_index()
     fig = px.scatter(
         seg,
         x="Satış",
@@ -93,22 +154,101 @@ def segment_scatter(df):
     return fig
 
 
-def profit_scatter(df, threshold=0.10):
-    # Kâr ve kâr marjı hesapla
-    df["Kar"] = df["Tahsilat"] - df["Gider"]
-    df["Kar Marjı"] = df["Kar"] / df["Satış"]
-    df["Kar Marjı"] = df["Kar Marjı"].replace([np.inf, -np.inf], np.nan).clip(lower=-1, upper=1)
-    df["Segment"] = df["Segment"].astype(str).str.strip().fillna("Bilinmiyor")
+# profit_scatter iz sırası: 0 müşteriler, 1 eşik çizgisi, 2 eşik altı işaretleri;
+# yoğunluk katmanı varsa en alta eklenir ve diğer indeksler bir kayar (profit_trace_offset)
+PROFIT_LINE_TRACE = 1
+PROFIT_BELOW_TRACE = 2
+PROFIT_POINT_BUDGET = 2000     # bundan fazla müşteri: aykırılar nokta, kalanı yoğunluk katmanı
+PROFIT_WEBGL_THRESHOLD = 1000  # bundan fazla nokta: SVG yerine WebGL (Scattergl)
+PROFIT_DENSITY_BINS = 60
+
+
+def dominant_category(frame, key, category, weight=None):
+    """Her key değeri için en sık görülen category değeri (groupby + mode'un vektörel karşılığı).
+
+    weight verilirse satır sayısı yerine o sütunun toplamı kullanılır (ör. küpte "Kayıt").
+    Eşitlikte alfabetik ilk değer seçilir; boş category değerleri sayılmaz.
+    """
+    grouped = frame.groupby([key, category], observed=True, sort=False)
+    counts = (grouped[weight].sum() if weight else grouped.size()).rename("_count").reset_index()
+    # Tek sıralama + ilk satır: grup başına Python çağrısı yok
+    counts = counts.sort_values([key, "_count", category], ascending=[True, False, True], kind="stable")
+    return counts.drop_duplicates(key).set_index(key)[category]
+
+
+def customer_profit_summary(cube):
+    # Müşteri bazlı özet (Kar ve satır bazlı Kar Marjı küpte hazır)
+    rolled = rollup(cube, "Müşteri")
+    # Baskın segment: en çok kayda sahip segment, eşitlikte alfabetik ilk
+    dominant = dominant_category(cube, "Müşteri", "Segment", weight=ROW_COUNT).astype(object)
+    # Türetilen sütunlar assign ile yeni çerçevede: copy-on-write kapalıyken de dilime yazılmaz
+    df_grouped = rolled[["Satış", "Tahsilat", "Gider", "Kar"]].assign(**{
+        "Kar Marjı": mean(rolled, "Kar Marjı"),
+        "Segment": dominant.reindex(rolled.index).fillna("Bilinmiyor"),
+    })
+    return df_grouped.reset_index()
+
+
+def profit_points(df_grouped, point_budget=PROFIT_POINT_BUDGET):
+    """Tek tek çizilecek müşterileri seçer; bütçe aşılırsa en aykırı müşteriler kalır.
+
+    (noktalar, yoğunluk_katmanı_gerekli_mi) döndürür.
+    """
+    if len(df_grouped) <= point_budget:
+        return df_grouped, False
+    # Aykırılık: Satış ya da Kâr'da ortalamadan en çok sapan (|z| en büyük) müşteriler
+    values = df_grouped[["Satış", "Kar"]].to_numpy(dtype=float)
+    std = values.std(axis=0)
+    std[std == 0] = 1
+    score = np.abs((values - values.mean(axis=0)) / std).max(axis=1)
+    keep = np.sort(np.argpartition(score, -point_budget)[-point_budget:])
+    return df_grouped.iloc[keep], True
+
+
+def profit_trace_offset(density):
+    return 1 if density else 0
+
+
+def profit_density_trace(df_grouped, bins=PROFIT_DENSITY_BINS):
+    # Tüm müşterilerin yoğunluğu sunucuda bin'lenir; tarayıcıya sadece bins x bins matris gider
+    counts, x_edges, y_edges = np.histogram2d(df_grouped["Satış"], df_grouped["Kar"], bins=bins)
+    z = np.where(counts > 0, counts, np.nan).T
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        colorscale="Greys",
+        showscale=False,
+        opacity=0.5,
+        name="Müşteri Yoğunluğu",
+        showlegend=True,
+        hovertemplate="Satış: ₺%{x:,.0f}<br>Kâr: ₺%{y:,.0f}<br>Müşteri: %{z}<extra></extra>"
+    )
+
+
+def profit_threshold_traces(df_grouped, threshold):
+    # Eşik çizgisi ve eşik altı müşteriler; eşik kaydırıcısı sadece bunları Patch'ler
+    x_min = max(0, float(df_grouped["Satış"].min() or 0))
+    x_max = float(df_grouped["Satış"].max() or 1000000)
+    line = dict(
+        x=[x_min, x_max],
+        y=[threshold * x_min, threshold * x_max],
+        name=f"Kâr Marjı %{int(threshold * 100)} Eşiği"
+    )
+    # Eşik altı izi sadece işaret koordinatlarını taşır: müşteri adı ve tooltip ana izde
+    df_below = df_grouped[df_grouped["Kar"] < threshold * df_grouped["Satış"]]
+    below = dict(
+        x=df_below["Satış"].tolist(),
+        y=df_below["Kar"].tolist()
+    )
+    return line, below
+
 
-    # Müşteri bazlı özet
-    df_grouped = df.groupby("Müşteri").agg({
-        "Satış": "sum",
-        "Tahsilat": "sum",
-        "Gider": "sum",
-        "Kar": "sum",
-        "Kar Marjı": "mean",
-        "Segment": lambda x: x.mode().iloc[0] if not x.mode().empty else "Bilinmiyor"
-    }).reset_index()
+def profit_scatter(cube, threshold=0.10, point_budget=PROFIT_POINT_BUDGET):
+    with stage("toplama"):
+        df_grouped = customer_profit_summary(cube)
+        points, density = profit_points(df_grouped, point_budget)
+    webgl = len(points) > PROFIT_WEBGL_THRESHOLD
 
     # Renk skalası: 0 merkezli, simetrik
     kar_marji_min = float(df_grouped["Kar Marjı"].min() or -0.3)
@@ -117,7 +257,7 @@ def profit_scatter(df, threshold=0.10):
     range_min, range_max = -max_abs, max_abs
 
     fig = px.scatter(
-        df_grouped,
+        points,
         x="Satış",
         y="Kar",
         color="Kar Marjı",
@@ -131,35 +271,31 @@ def profit_scatter(df, threshold=0.10):
             "Kar": "Toplam Kâr (₺)",
             "Kar Marjı": "Kâr Marjı"
         },
-        custom_data=["Segment", "Kar Marjı"]
+        render_mode="webgl" if webgl else "svg"
     )
 
-    # Tooltip
+    # Tooltip: kâr marjı zaten marker.color'da; customdata düz (tek boyutlu) segment listesi
     fig.update_traces(
+        customdata=points["Segment"].astype(str).to_numpy(),
         hovertemplate="<b>%{hovertext}</b>"
-                      "<br>Segment: %{customdata[0]}"
+                      "<br>Segment: %{customdata}"
                       "<br>Satış: ₺%{x:,.0f}"
                       "<br>Kâr: ₺%{y:,.0f}"
-                      "<br>Kâr Marjı: %{customdata[1]:.1%}<extra></extra>"
+                      "<br>Kâr Marjı: %{marker.color:.1%}<extra></extra>"
     )
 
     # Eşik çizgisi
-    x_min = max(0, float(df_grouped["Satış"].min() or 0))
-    x_max = float(df_grouped["Satış"].max() or 1000000)
+    line, below = profit_threshold_traces(points, threshold)
     fig.add_scatter(
-        x=[x_min, x_max],
-        y=[threshold * x_min, threshold * x_max],
+        **line,
         mode="lines",
-        line=dict(color="red", dash="dash", width=2),
-        name=f"Kâr Marjı %{int(threshold * 100)} Eşiği"
+        line=dict(color="red", dash="dash", width=2)
     )
 
     # Eşik altı müşterileri işaretle (mobil için daha küçük)
-    df_below = df_grouped[df_grouped["Kar"] < threshold * df_grouped["Satış"]]
     fig.add_trace(
-        go.Scatter(
-            x=df_below["Satış"],
-            y=df_below["Kar"],
+        (go.Scattergl if webgl else go.Scatter)(
+            **below,
             mode="markers",
             marker=dict(
                 symbol="x",
@@ -168,11 +304,15 @@ def profit_scatter(df, threshold=0.10):
                 line=dict(width=1.2)
             ),
             name="Eşik Altı Müşteri",
-            hovertemplate="%{text}<br>Satış: ₺%{x:,.0f}<extra></extra>",
-            text=df_below["Müşteri"]
+            hoverinfo="skip"            # fare altındaki ana iz noktası tooltip'i gösterir
         )
     )
 
+    # Yüksek kardinalite: noktaya dönüşmeyen müşteriler yoğunluk katmanında, en altta
+    if density:
+        fig.add_trace(profit_density_trace(df_grouped))
+        fig.data = fig.data[-1:] + fig.data[:-1]
+
     # ── MOBİL DOSTU LAYOUT ────────────────────────────────
     fig.update_layout(
         margin=dict(l=20, r=20, t=50, b=140),   # ← ALT MARGIN'İ ÖNEMLİ ARTTIRDIK (140px)
@@ -229,14 +369,10 @@ def profit_scatter(df, threshold=0.10):
     return fig
 
 
-def sales_year_comparison_chart(df):
-    df["Tarih"] = pd.to_datetime(df["Tarih"], dayfirst=True, errors="coerce")
-    df["Satış"] = pd.to_numeric(df["Satış"], errors="coerce")
-
-    df["Yıl"] = df["Tarih"].dt.year
-    df["Ay"] = df["Tarih"].dt.month
-
-    grouped = df.groupby(["Yıl", "Ay"])["Satış"].sum().reset_index()
+def sales_year_comparison_chart(cube):
+    # Yıl/Ay küpte hazır (CUBE_CALENDAR)
+    with stage("toplama"):
+        grouped = cube.groupby(["Yıl", "Ay"])["Satış"].sum().reset_index()
 
     fig = px.line(
         grouped,
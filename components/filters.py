@@ -1,8 +1,13 @@
 from dash import dcc
 
-def generate_filters(df):
-    segment_options = [{"label": s, "value": s} for s in sorted(df["Segment"].dropna().unique())]
-    customer_options = [{"label": c, "value": c} for c in sorted(df["Müşteri"].dropna().unique())]
+from services.search import search_option
+
+def generate_filters(profile, customer_limit=50):
+    # Sıralı tekil değerler veri seti profilinde hazır (services.profile)
+    segment_options = [{"label": s, "value": s} for s in profile.segments]
+    # Müşteri listesi layout'a gömülmez: ilk customer_limit müşteri, gerisi yazdıkça
+    # sunucudaki arama indeksinden gelir (app.update_customer_options)
+    customer_options = [search_option(c) for c in profile.customers[:customer_limit]]
 
     return [
         dcc.Dropdown(
@@ -16,6 +21,6 @@ def generate_filters(df):
             id="customer-filter",
             options=customer_options,
             multi=True,
-            placeholder="Müşteri seçin"
+            placeholder="Müşteri ara / seçin"
         )
     ]
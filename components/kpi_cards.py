@@ -1,10 +1,10 @@
 import dash_bootstrap_components as dbc
 from dash import html
 
-def generate_kpi_cards(df):
-    total_sales  = df["Satış"].sum()
-    total_cashin = df["Tahsilat"].sum()
-    total_expense = df["Gider"].sum()
+def generate_kpi_cards(cube):
+    total_sales  = cube["Satış"].sum()
+    total_cashin = cube["Tahsilat"].sum()
+    total_expense = cube["Gider"].sum()
     net_cash     = total_cashin - total_expense
 
     cards = dbc.Row([
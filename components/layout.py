@@ -1,20 +1,26 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-from components.kpi_cards import generate_kpi_cards
+import plotly.io as pio
 from components.filters import generate_filters
-from components.charts import (
-    sales_trend_chart,
-    top_stock_chart,
-    cash_vs_expense_pie,
-    segment_scatter,
-    profit_scatter,
-    sales_year_comparison_chart
-)
 
-def main_layout(df):
-    min_date = df["Tarih"].min().date()
-    max_date = df["Tarih"].max().date()
-    segment_dropdown, customer_dropdown = generate_filters(df)
+# Grafikler layout'ta üretilmez: ilk çizim callback'lerden gelir (varsayılan durum
+# uygulama açılışında önbelleğe alınır). O ana kadar boş, şeffaf bir yer tutucu gösterilir.
+PLACEHOLDER_FIGURE = {
+    "data": [],
+    "layout": {
+        "xaxis": {"visible": False},
+        "yaxis": {"visible": False},
+        "paper_bgcolor": "rgba(0,0,0,0)",
+        "plot_bgcolor": "rgba(0,0,0,0)",
+        "annotations": [{"text": "Yükleniyor...", "showarrow": False,
+                         "font": {"size": 14, "color": "#888"}}],
+    },
+}
+
+def main_layout(profile, customer_limit=50):
+    min_date = profile.start_date
+    max_date = profile.end_date
+    segment_dropdown, customer_dropdown = generate_filters(profile, customer_limit)
 
 
     return html.Div(
@@ -46,6 +52,12 @@ def main_layout(df):
                         },
                         multiple=False
                     ),
+                    dbc.Switch(
+                        id="upload-append",
+                        label="Mevcut yüklenmiş verinin üzerine ekle (aylık güncelleme)",
+                        value=False,
+                        className="d-flex justify-content-center small"
+                    ),
                     html.Div([
                         "Örnek veri setini indirmek için ",
                         html.A(
@@ -58,6 +70,13 @@ def main_layout(df):
                         "."
                     ], className="text-center mt-2 small text-muted"),
                     html.Div(id="upload-status", className="text-center mt-2"),
+                    # Arka plan yüklemelerinde ilerleme ve iptal
+                    html.Div(id="upload-progress", className="text-center small text-muted mt-1"),
+                    html.Div(
+                        dbc.Button("Yüklemeyi İptal Et", id="upload-cancel", color="danger",
+                                   outline=True, size="sm", disabled=True),
+                        className="text-center mt-2"
+                    ),
                     dcc.Store(id="uploaded-data", storage_type="memory")
                 ])
             ], className="mb-4"),
@@ -76,6 +95,10 @@ def main_layout(df):
                             html.I(className="fa fa-moon me-2", style={"fontSize": "1.3rem"}),
                             dbc.Switch(id="color-mode-switch", value=False, persistence=True),
                             html.I(className="fa fa-sun ms-2", style={"fontSize": "1.3rem"}),
+                            # Tema değişiminde figürlere tarayıcıda uygulanacak şablonlar
+                            dcc.Store(id="figure-templates",
+                                      data={name: pio.templates[name].to_plotly_json()
+                                            for name in ("bootstrap", "bootstrap_dark")}),
                         ], className="d-flex align-items-center justify-content-end"),
                         md=12, xs=12,
                         className="position-absolute top-0 end-0 mt-0 me-3"  # mt-2 ile toggle'ı biraz aşağı çek, başlık ile arasına boşluk gelsin
@@ -83,7 +106,8 @@ def main_layout(df):
                 ]
             ),
 
-            html.Div(id="kpi-cards", children=generate_kpi_cards(df), className="mb-4"),
+            html.Div(id="kpi-cards", children=dbc.Spinner(color="secondary", size="sm"),
+                     className="mb-4 text-center"),
             html.Hr(className="border-secondary"),
 
             # Satış trendi + tarih filtreleri
@@ -97,13 +121,14 @@ def main_layout(df):
                             {"label": " Son 3 Ay", "value": "3M"},
                             {"label": " Son 6 Ay", "value": "6M"},
                             {"label": " Son 1 Yıl", "value": "12M"},
+                            {"label": " Tümü", "value": "ALL"},
                         ],
                         value="3M",
                         labelStyle={"display": "inline-block", "margin-right": "15px"},
                         inputStyle={"margin-right": "8px"},
                         style={"textAlign": "center", "marginBottom": "10px"}
                     ),
-                    dcc.Graph(id="sales-trend", figure=sales_trend_chart(df),
+                    dcc.Graph(id="sales-trend", figure=PLACEHOLDER_FIGURE,
                               responsive=True,
                               config={'responsive': True, 'displayModeBar': False, 'scrollZoom': False},
                               style={'width': '100%', 'height': '400px', 'minHeight': '300px', 'maxHeight': '50vh','backgroundColor': 'transparent'})
@@ -237,16 +262,16 @@ def main_layout(df):
 
             # Grafikler
             dbc.Row([
-                dbc.Col(dcc.Graph(id="top-stock", figure=top_stock_chart(df), responsive=True,
+                dbc.Col(dcc.Graph(id="top-stock", figure=PLACEHOLDER_FIGURE, responsive=True,
                                   config={'responsive': True, 'displayModeBar': False},
                                   style={'width': '100%', 'height': '400px'}), md=6),
-                dbc.Col(dcc.Graph(id="cash-expense", figure=cash_vs_expense_pie(df), responsive=True,
+                dbc.Col(dcc.Graph(id="cash-expense", figure=PLACEHOLDER_FIGURE, responsive=True,
                                   config={'responsive': True, 'displayModeBar': False},
                                   style={'width': '100%', 'height': '400px', 'minHeight': '300px'}), md=6)
             ], className="mb-4"),
 
             dbc.Row([
-                dbc.Col(dcc.Graph(id="segment-scatter", figure=segment_scatter(df), responsive=True,
+                dbc.Col(dcc.Graph(id="segment-scatter", figure=PLACEHOLDER_FIGURE, responsive=True,
                                   config={'responsive': True, 'displayModeBar': False},
                                   style={'width': '100%', 'height': '450px'}), md=12)
             ], className="mb-5"),
@@ -263,13 +288,13 @@ def main_layout(df):
             dbc.Row(className="mt-5"),  # boşluk
 
             dbc.Row([
-                dbc.Col(dcc.Graph(id="profit-scatter", figure=profit_scatter(df), responsive=True,
+                dbc.Col(dcc.Graph(id="profit-scatter", figure=PLACEHOLDER_FIGURE, responsive=True,
                                   config={'responsive': True, 'displayModeBar': False},
                                   style={'width': '100%', 'height': '500px'}), md=12)
             ], className="mb-5"),
             
             dbc.Row([
-                dbc.Col(dcc.Graph(id="sales-year-comparison", figure=sales_year_comparison_chart(df), responsive=True,
+                dbc.Col(dcc.Graph(id="sales-year-comparison", figure=PLACEHOLDER_FIGURE, responsive=True,
                                   config={'responsive': True, 'displayModeBar': False},
                                   style={'width': '100%', 'height': '400px'}), md=12)
             ]),
@@ -0,0 +1 @@
+# pytest kök dizini: testler services/ ve components/ modüllerini proje kökünden içe aktarır
@@ -0,0 +1,11 @@
+import os
+
+# app modülü master süreçte bir kez import edilir: temel veri seti, küpü ve indeksleri
+# fork edilen worker'larla paylaşılır (copy-on-write), her worker ayrıca yüklemez
+preload_app = True
+
+# Worker sayısı WEB_CONCURRENCY ile ayarlanır; bellek paylaşıldığı için artırmak ucuzdur
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+
+# Büyük dosya yüklemeleri arka plan işine devredilmezse (MDASH_BACKGROUND_UPLOADS=0) uzun sürebilir
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
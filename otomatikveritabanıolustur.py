@@ -1,48 +1,90 @@
+import argparse
+import string
+
 import pandas as pd
 import numpy as np
 
-np.random.seed(42)
-
-dates = pd.date_range("2022-01-01", "2025-12-31", freq="M")  # aylık veri, daha kompakt
-customers = [
-    "Müşteri_0", "Müşteri_4", "Müşteri_6", "Müşteri_10", "Müşteri_30",
-    "Müşteri_A", "Müşteri_B", "Müşteri_C"
-]
-segments = ["A", "B", "C", "D"]
-
-rows = []
-
-for date in dates:
-    for cust in customers:
-        seg = np.random.choice(segments)
-        sales = np.random.randint(10000, 20000)
-
-        # Kontrollü kâr marjı senaryoları
-        if cust == "Müşteri_0":
-            tahsilat = sales
-            gider = sales  # kâr = 0 → marj = 0
-        elif cust == "Müşteri_4":
-            tahsilat = sales
-            gider = sales * 0.96  # kâr marjı ≈ %4
-        elif cust == "Müşteri_6":
-            tahsilat = sales
-            gider = sales * 0.94  # kâr marjı ≈ %6
-        elif cust == "Müşteri_10":
-            tahsilat = sales
-            gider = sales * 0.90  # kâr marjı ≈ %10
-        elif cust == "Müşteri_30":
-            tahsilat = sales
-            gider = sales * 0.70  # kâr marjı ≈ %30
-        else:
-            # Rastgele senaryolar (pozitif/negatif kar marjı)
-            tahsilat = sales * np.random.uniform(0.8, 1.2)
-            gider = tahsilat * np.random.uniform(0.5, 1.1)
-
-        stok = np.random.randint(50, 500)
-
-        rows.append([date, cust, seg, sales, tahsilat, gider, stok])
-
-df = pd.DataFrame(rows, columns=["Tarih", "Müşteri", "Segment", "Satış", "Tahsilat", "Gider", "Stok"])
-df.to_csv("mikro_dummy_data.csv", index=False, encoding="utf-8-sig")
-
-print("Yeni dummy veri dosyası oluşturuldu: mikro_dummy_data.csv")
+# Kontrollü kâr marjı senaryoları (eşik grafiği için): müşteri -> sabit kâr marjı
+SCENARIO_MARGINS = {
+    "Müşteri_0": 0.0,    # kâr = 0 → marj = 0
+    "Müşteri_4": 0.04,   # kâr marjı ≈ %4
+    "Müşteri_6": 0.06,   # kâr marjı ≈ %6
+    "Müşteri_10": 0.10,  # kâr marjı ≈ %10
+    "Müşteri_30": 0.30,  # kâr marjı ≈ %30
+}
+# İlk müşteriler her zaman senaryo müşterileri + rastgele senaryolu A/B/C
+BASE_CUSTOMERS = list(SCENARIO_MARGINS) + ["Müşteri_A", "Müşteri_B", "Müşteri_C"]
+
+
+def customer_names(count):
+    # Ek müşteriler 6 haneli: "Müşteri_10" gibi senaryo adlarıyla çakışmaz
+    extra = [f"Müşteri_{i:06d}" for i in range(len(BASE_CUSTOMERS), count)]
+    return (BASE_CUSTOMERS + extra)[:count]
+
+
+def segment_names(count):
+    letters = list(string.ascii_uppercase)
+    return (letters + [f"S{i}" for i in range(len(letters), count)])[:count]
+
+
+def generate(rows=None, customers=8, segments=4, freq="D",
+             start="2022-01-01", end="2025-12-31", seed=42):
+    """Sentetik ERP satırları üretir; aynı parametreler ve seed ile her zaman aynı veri.
+
+    rows verilmezse her dönem x her müşteri için bir satır (eski düzen), verilirse
+    dönemler arasından rastgele seçilmiş, tarihe göre sıralı rows satır üretilir.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, end, freq=freq)
+    names = customer_names(customers)
+    segs = segment_names(segments)
+
+    if rows is None:
+        date_idx = np.repeat(np.arange(len(dates)), len(names))
+        cust_idx = np.tile(np.arange(len(names)), len(dates))
+    else:
+        date_idx = np.sort(rng.integers(0, len(dates), rows))
+        cust_idx = rng.integers(0, len(names), rows)
+    n = len(date_idx)
+
+    sales = rng.integers(10000, 20000, n)
+    # Rastgele senaryolar (pozitif/negatif kar marjı)
+    tahsilat = sales * rng.uniform(0.8, 1.2, n)
+    gider = tahsilat * rng.uniform(0.5, 1.1, n)
+    margins = np.array([SCENARIO_MARGINS.get(name, np.nan) for name in names])[cust_idx]
+    fixed = ~np.isnan(margins)
+    tahsilat[fixed] = sales[fixed]
+    gider[fixed] = sales[fixed] * (1 - margins[fixed])
+
+    return pd.DataFrame({
+        "Tarih": dates[date_idx],
+        "Müşteri": pd.Categorical.from_codes(cust_idx, names),
+        "Segment": pd.Categorical.from_codes(rng.integers(0, len(segs), n), segs),
+        "Satış": sales,
+        "Tahsilat": tahsilat.round(2),
+        "Gider": gider.round(2),
+        "Stok": rng.integers(50, 500, n),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik dummy veri üretici")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="satır sayısı (verilmezse her dönem x her müşteri)")
+    parser.add_argument("--customers", type=int, default=8)
+    parser.add_argument("--segments", type=int, default=4)
+    parser.add_argument("--freq", default="ME", help="dönem sıklığı: D (günlük), W, ME (aylık)")
+    parser.add_argument("--start", default="2022-01-01")
+    parser.add_argument("--end", default="2025-12-31")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="mikro_dummy_data.csv")
+    args = parser.parse_args()
+
+    df = generate(args.rows, args.customers, args.segments, args.freq, args.start, args.end, args.seed)
+    df.to_csv(args.output, index=False, encoding="utf-8-sig")
+
+    print(f"Yeni dummy veri dosyası oluşturuldu: {args.output} ({len(df):,} satır)")
+
+
+if __name__ == "__main__":
+    main()
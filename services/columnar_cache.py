@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+
+from services.loader import PARSER_VERSION, SCHEMA
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:   # pyarrow yoksa önbellek devre dışı kalır, CSV/XLSX her seferinde parse edilir
+    feather = None
+
+# DataFrame.attrs (temiz işareti, parmak izi) Arrow şema metadata'sında bu anahtarla saklanır
+ATTRS_METADATA_KEY = b"mdash.attrs"
+
+
+def prune_lru(directory, max_bytes, group_of=lambda name: name, keep=()):
+    """directory'deki dosyaları max_bytes altına indirir; en eski kullanılan grup önce silinir.
+
+    group_of(dosya adı) birlikte silinecek dosyaları gruplar (ör. bir token'ın tüm
+    dosyaları); bir grubun son kullanımı en yeni dosyasının mtime'ıdır. keep'teki
+    gruplar silinmez. Belleğe eşlenmiş dosyaları silmek açık eşlemeleri bozmaz.
+    Silinen grup sayısını döndürür.
+    """
+    groups = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            # Yazımı süren geçici dosyalara dokunulmaz
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+            stat = entry.stat()
+        except OSError:      # başka süreç aynı anda silmiş olabilir
+            continue
+        size, mtime, paths = groups.get(group_of(entry.name), (0, 0.0, []))
+        groups[group_of(entry.name)] = (size + stat.st_size, max(mtime, stat.st_mtime), paths + [entry.path])
+    total = sum(size for size, _, _ in groups.values())
+    removed = 0
+    for group, (size, _, paths) in sorted(groups.items(), key=lambda item: item[1][1]):
+        if total <= max_bytes:
+            break
+        if group in keep:
+            continue
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+        removed += 1
+    return removed
+
+
+class ColumnarCache:
+    """Temizlenmiş veri setlerini içerik hash'ine göre Feather (Arrow IPC) olarak saklar.
+
+    Dosyalar sıkıştırmasız yazılır; böylece sonraki yüklemeler metin parse
+    etmeden, dosyayı belleğe eşleyerek (memory map) okunur. Eşlenen sayfalar
+    işletim sisteminin sayfa önbelleğinde olduğundan aynı dosyayı okuyan
+    süreçler (gunicorn worker'ları) belleği paylaşır. max_bytes verilirse her
+    yazımdan sonra dizin bu boyuta indirilir (en uzun süredir okunmayan dosya önce).
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = feather is not None and bool(cache_dir)
+        if self.enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, default_dir=None):
+        return cls(os.environ.get("MDASH_CACHE_DIR", default_dir),
+                   max_bytes=int(os.environ.get("MDASH_CACHE_MB", "512")) * 1024 * 1024)
+
+    @staticmethod
+    def key_for(data, *salt):
+        # data: bayt ya da bayt parçaları üreten bir iterable (akış halinde hash için)
+        # salt: içerik aynı olsa da parse şekli farklı olan girdileri ayırmak için (ör. uzantı)
+        digest = hashlib.sha256()
+        for chunk in ([data] if isinstance(data, (bytes, bytearray, memoryview)) else data):
+            digest.update(chunk)
+        for part in salt:
+            digest.update(str(part).encode("utf-8"))
+        # Şema (tipler) ya da parse davranışı değişirse eski önbellek dosyaları kullanılmaz
+        digest.update(repr((sorted(SCHEMA.items()), PARSER_VERSION)).encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def contains(self, key):
+        return self.enabled and os.path.exists(self._path(key))
+
+    def load(self, key):
+        if not self.contains(key):
+            return None
+        path = self._path(key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+            os.utime(path)       # LRU temizliği için son kullanım
+        except OSError:          # arada temizlenmiş olabilir
+            return None
+        attrs = json.loads((table.schema.metadata or {}).get(ATTRS_METADATA_KEY, b"{}"))
+        # split_blocks: boş değer içermeyen sayısal sütunlar eşlenmiş bellekten kopyasız okunur
+        df = table.to_pandas(split_blocks=True)
+        df.attrs.update(attrs)
+        return df
+
+    def store(self, key, df, **attrs):
+        # attrs: df.attrs'a ek olarak dosyayla birlikte saklanacak JSON uyumlu değerler
+        if not self.enabled:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = dict(table.schema.metadata or {})
+            metadata[ATTRS_METADATA_KEY] = json.dumps({**df.attrs, **attrs}).encode("utf-8")
+            table = table.replace_schema_metadata(metadata)
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+            if self.max_bytes is not None:
+                prune_lru(self.cache_dir, self.max_bytes, keep={os.path.basename(path)})
+        except OSError:
+            # Önbellek yazılamazsa (salt okunur disk vb.) veri yine de kullanılabilir
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
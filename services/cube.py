@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+# Küp boyutları ve ölçüleri: her ölçü için toplam, boş olabilenler için ayrıca adet tutulur
+CUBE_KEYS = ["Tarih", "Müşteri", "Segment"]
+CUBE_MEASURES = ["Satış", "Tahsilat", "Gider", "Stok", "Kar", "Kar Marjı", "Pozitif Satış"]
+ROW_COUNT = "Kayıt"
+# Boş olabilen ölçüler; diğerleri zorunlu sütunlardan türediği için adetleri = Kayıt
+NULLABLE_MEASURES = ["Stok", "Kar Marjı", "Pozitif Satış"]
+# Tarih'ten türetilen takvim sütunları: küp kurulurken bir kez hesaplanır, toplanmaz
+CUBE_CALENDAR = ["Yıl", "Ay"]
+
+
+def count_column(measure):
+    return f"{measure} Adet" if measure in NULLABLE_MEASURES else ROW_COUNT
+
+
+def _count_columns():
+    return [count_column(m) for m in NULLABLE_MEASURES] + [ROW_COUNT]
+
+
+def build_cube(df):
+    """Temiz (services.loader) satırları (gün, Müşteri, Segment) düzeyinde toplam/adet küpüne indirger."""
+    # Stok satırlarda float32 tutulur; türetme ve toplama float64 ile yapılır
+    satis = df["Satış"].astype("float64")
+    kar = df["Tahsilat"].astype("float64") - df["Gider"].astype("float64")
+    kar_marji = (kar / satis).replace([np.inf, -np.inf], np.nan).clip(lower=-1, upper=1)
+    work = pd.DataFrame({
+        "Tarih": df["Tarih"].dt.normalize(),
+        "Müşteri": df["Müşteri"],
+        "Segment": df["Segment"],
+        "Satış": satis,
+        "Tahsilat": df["Tahsilat"].astype("float64"),
+        "Gider": df["Gider"].astype("float64"),
+        "Stok": df["Stok"].astype("float64"),
+        "Kar": kar,
+        "Kar Marjı": kar_marji,
+        "Pozitif Satış": satis.where(satis > 0),
+    })
+
+    grouped = work.groupby(CUBE_KEYS, dropna=False, sort=True, observed=True)
+    sums = grouped[CUBE_MEASURES].sum()
+    counts = grouped[NULLABLE_MEASURES].count().rename(columns=count_column)
+    cube = pd.concat([sums, counts], axis=1)
+    cube[ROW_COUNT] = grouped.size()
+    return _finalize(cube.reset_index())
+
+
+def _finalize(cube):
+    # Adet sütunları int32 yeter (hücre başına satır sayısı)
+    counts = _count_columns()
+    cube[counts] = cube[counts].astype("int32")
+    # Yıl/Ay anahtarların hemen arkasına; grafikler her çağrıda dt.year/dt.month hesaplamaz
+    cube.insert(len(CUBE_KEYS), "Yıl", cube["Tarih"].dt.year.astype("int16"))
+    cube.insert(len(CUBE_KEYS) + 1, "Ay", cube["Tarih"].dt.month.astype("int8"))
+    return cube
+
+
+def rollup(cube, by):
+    """Küpü verilen boyut(lar)a göre toplar; ortalamalar mean() ile türetilir."""
+    columns = CUBE_MEASURES + _count_columns()
+    return cube.groupby(by, sort=True, observed=True)[columns].sum()
+
+
+def mean(rolled, measure):
+    # Adet 0 ise ortalama tanımsız (NaN)
+    return rolled[measure] / rolled[count_column(measure)].replace(0, np.nan)
+
+
+def merge_cube(cube, added, removed=None):
+    """Eklenen ve çıkarılan satırların küplerini mevcut küpe işler.
+
+    Sadece değişen günlere düşen küp satırları yeniden toplanır; geri kalan
+    dilimler olduğu gibi korunur. Kategorik sütunların kategorileri önceden
+    birleştirilmiş olmalıdır.
+    """
+    value_columns = [c for c in cube.columns if c not in CUBE_KEYS + CUBE_CALENDAR]
+    parts = [added]
+    if removed is not None and not removed.empty:
+        negated = removed.copy()
+        negated[value_columns] = -negated[value_columns]
+        parts.append(negated)
+    first = min(p["Tarih"].iloc[0] for p in parts)
+    last = max(p["Tarih"].iloc[-1] for p in parts)
+    dates = cube["Tarih"].to_numpy()
+    lo = int(np.searchsorted(dates, first.to_datetime64(), side="left"))
+    hi = int(np.searchsorted(dates, last.to_datetime64(), side="right"))
+
+    window = pd.concat([cube.iloc[lo:hi]] + parts, ignore_index=True)
+    merged = window.groupby(CUBE_KEYS, dropna=False, sort=True, observed=True)[value_columns].sum()
+    merged = _finalize(merged[merged[ROW_COUNT] > 0].reset_index())
+    return pd.concat([cube.iloc[:lo], merged, cube.iloc[hi:]], ignore_index=True)
@@ -0,0 +1,129 @@
+import hashlib
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from services.cube import build_cube, merge_cube
+from services.index import sorted_dates, date_range_bounds, CategoryIndex
+from services.loader import clean, mark_clean
+from services.profile import DatasetProfile
+
+
+@dataclass
+class Dataset:
+    """Temizlenmiş ham satırlar ve bunlardan bir kez üretilen toplam küpü.
+
+    Hem satırlar hem küp Tarih'e göre sıralı tutulur; tarih aralıkları
+    searchsorted ile kopyasız, ardışık dilimlere çevrilir. Segment ve Müşteri
+    kategorik tutulur ve küp için değer -> pozisyon indeksleri saklanır.
+    Tarih sınırları ve filtre seçenekleri kurulumda bir kez profile'a çıkarılır.
+    """
+    frame: pd.DataFrame
+    cube: pd.DataFrame
+    frame_dates: np.ndarray = field(init=False, repr=False)
+    cube_dates: np.ndarray = field(init=False, repr=False)
+    segment_index: CategoryIndex = field(init=False, repr=False)
+    customer_index: CategoryIndex = field(init=False, repr=False)
+    fingerprint: str = None
+    profile: DatasetProfile = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.frame_dates = sorted_dates(self.frame)
+        self.cube_dates = sorted_dates(self.cube)
+        self.segment_index = CategoryIndex(self.cube["Segment"])
+        self.customer_index = CategoryIndex(self.cube["Müşteri"])
+        # İçerik parmak izi: aynı veri aynı önbellek anahtarlarını üretir
+        if self.fingerprint is None:
+            row_hashes = pd.util.hash_pandas_object(self.frame, index=False).to_numpy()
+            self.fingerprint = hashlib.blake2b(row_hashes.tobytes(), digest_size=8).hexdigest()
+        if self.profile is None:
+            self.profile = DatasetProfile.from_dataset(self.frame, self.cube, self.fingerprint)
+
+    @classmethod
+    def from_frame(cls, df):
+        # Temiz işaretli çerçeve (loader/ingest/önbellek) yeniden tip dönüşümünden geçmez;
+        # önbellekten gelen çerçeve zaten sıralı: kopyalamadan kullan
+        df = clean(df)
+        if not df["Tarih"].is_monotonic_increasing:
+            df = mark_clean(df.sort_values("Tarih", kind="stable", ignore_index=True))
+        # build_cube Tarih'i ilk anahtar olarak sıralı gruplar
+        return cls(frame=df, cube=build_cube(df))
+
+    def append(self, delta):
+        """delta veri setini ekler; (Tarih, Müşteri) anahtarı çakışan mevcut satırlar yenileriyle değişir.
+
+        delta içinde aynı anahtarı taşıyan satırlardan sonuncusu kalır. Yeni Dataset,
+        değiştirilen mevcut satır sayısı ve delta'dan atılan tekrar satır sayısını
+        döndürür. Küpte sadece delta'nın tarih aralığına düşen hücreler yeniden hesaplanır.
+        """
+        if delta.frame.empty:
+            return self, 0, 0
+        duplicated = delta.frame.duplicated(["Tarih", "Müşteri"], keep="last")
+        duplicates = int(duplicated.sum())
+        if duplicates:
+            # Delta küpü de tekrarsız satırlardan yeniden kurulur
+            delta = Dataset.from_frame(mark_clean(delta.frame[~duplicated].reset_index(drop=True)))
+        new = delta.frame
+        # Çakışma sadece delta'nın tarih aralığındaki mevcut satırlarda aranır
+        lo, hi = date_range_bounds(self.frame_dates, new["Tarih"].iloc[0], new["Tarih"].iloc[-1])
+        window = self.frame.iloc[lo:hi]
+        new_keys = pd.MultiIndex.from_arrays([new["Tarih"], new["Müşteri"].astype(object)])
+        replaced = pd.MultiIndex.from_arrays([window["Tarih"], window["Müşteri"].astype(object)]).isin(new_keys)
+        removed = window[replaced]
+
+        frame, new = _unify_categories([self.frame, new], ["Müşteri", "Segment"])
+        if removed.empty and new["Tarih"].iloc[0] >= frame["Tarih"].iloc[-1]:
+            # Sadece sona ekleme (aylık yeni dönem): yeniden sıralama gerekmez
+            frame = pd.concat([frame, new], ignore_index=True)
+        else:
+            frame = pd.concat([frame.drop(index=removed.index), new], ignore_index=True)
+            frame = frame.sort_values("Tarih", kind="stable", ignore_index=True)
+
+        cube, added = _unify_categories([self.cube, delta.cube], ["Müşteri", "Segment"])
+        removed_cube = None
+        if not removed.empty:
+            removed_cube = _unify_categories([cube, build_cube(removed)], ["Müşteri", "Segment"])[1]
+        cube = merge_cube(cube, added, removed_cube)
+
+        fingerprint = hashlib.blake2b(f"{self.fingerprint}+{delta.fingerprint}".encode(), digest_size=8).hexdigest()
+        return Dataset(frame=frame, cube=cube, fingerprint=fingerprint), len(removed), duplicates
+
+    @property
+    def nbytes(self):
+        return int(self.frame.memory_usage(deep=True).sum() + self.cube.memory_usage(deep=True).sum())
+
+    @property
+    def bytes_per_row(self):
+        # Ham satır başına toplam bellek (satırlar + küp payı)
+        return self.nbytes / max(len(self.frame), 1)
+
+    def slice_cube(self, start=None, end=None):
+        lo, hi = date_range_bounds(self.cube_dates, start, end)
+        return self.cube.iloc[lo:hi]
+
+    def filter_cube(self, start=None, end=None, segments=None, customers=None):
+        lo, hi = date_range_bounds(self.cube_dates, start, end)
+        if not segments and not customers:
+            return self.cube.iloc[lo:hi]
+        # Segment/Müşteri filtreleri sadece tarih dilimine düşen pozisyonlarda çalışır
+        positions = None
+        for index, selected in ((self.segment_index, segments), (self.customer_index, customers)):
+            if selected:
+                found = index.positions(selected, lo, hi)
+                positions = found if positions is None else np.intersect1d(positions, found, assume_unique=True)
+        return self.cube.iloc[positions]
+
+
+def _unify_categories(frames, columns):
+    # Birleştirilecek çerçevelerin kategorik sütunlarını ortak kategori kümesine çevirir
+    # (aksi halde pd.concat sütunu object tipine düşürür)
+    frames = list(frames)
+    for col in columns:
+        categories = frames[0][col].cat.categories
+        for other in frames[1:]:
+            categories = categories.union(other[col].cat.categories)
+        frames = [f if f[col].cat.categories.equals(categories)
+                  else f.assign(**{col: f[col].cat.set_categories(categories)})
+                  for f in frames]
+    return frames
@@ -0,0 +1,36 @@
+import os
+
+from services.figure_encoding import encode_figure
+from services.lru import LRUCache
+from services.metrics import stage
+
+
+class FigureCache:
+    """Grafik builder çıktıları için sınırlı boyutlu LRU önbellek.
+
+    Anahtar: (builder adı, veri seti parmak izi, normalize filtre demeti, builder argümanları).
+    Figürler temasız saklanır; şablonu tarayıcı uygular.
+    Değer olarak figürün sözlük (serileştirilmiş) hali saklanır; encode=True ise
+    sayısal diziler base64 tipli dizi olarak, tutarlar tam liraya yuvarlanmış tutulur.
+    """
+
+    def __init__(self, max_entries=256, encode=True):
+        self.encode = encode
+        self._items = LRUCache(max_entries)
+
+    @classmethod
+    def from_env(cls):
+        # MDASH_FIGURE_ENCODING=json: düz JSON listeleri (eski Plotly.js istemcileri / hata ayıklama)
+        return cls(max_entries=int(os.environ.get("MDASH_FIGURE_CACHE_SIZE", "256")),
+                   encode=os.environ.get("MDASH_FIGURE_ENCODING", "binary") != "json")
+
+    def get_or_build(self, key, build):
+        def build_value():
+            fig = build()
+            with stage("serileştirme"):
+                value = fig.to_dict()
+                return encode_figure(value) if self.encode else value
+        return self._items.get_or_build(key, build_value)
+
+    def stats(self):
+        return self._items.stats()
@@ -0,0 +1,73 @@
+import base64
+
+import numpy as np
+from plotly.io.json import to_json_plotly
+
+# Plotly.js 2.28+ (dash 2.17 ile gelen sürüm dahil) sayısal dizileri base64 tipli dizi
+# olarak çözer: {"dtype": "f4", "bdata": "...", "shape": "60,60"}
+TYPED_DTYPES = {
+    "int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2",
+    "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8",
+}
+# Bundan kısa dizilerde base64 sarmalayıcısı kazançtan büyük
+MIN_LENGTH = 16
+# Tutar taşıyan trace alanları: grafiklerde tam lira (",.0f") gösterilir, kuruş gönderilmez
+MONEY_FIELDS = {"x", "y", "values", "size"}
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _narrow(array, money):
+    if array.dtype.kind == "f":
+        if not money:
+            # Oran, yoğunluk gibi tutar dışı değerler için float32 hassasiyeti yeterli
+            return array.astype(np.float32)
+        array = np.round(array)
+        if not np.isfinite(array).all():
+            return array
+    elif array.dtype.itemsize <= 4:
+        return array
+    # Tam sayılar (ve yuvarlanmış tutarlar) int32'ye sığıyorsa i4, sığmıyorsa f8
+    if _INT32.min <= array.min() and array.max() <= _INT32.max:
+        return array.astype(np.int32)
+    return array.astype(np.float64)
+
+
+def typed_array(values, money=False):
+    """Sayısal bir diziyi Plotly.js tipli dizi sözlüğüne çevirir; uygun değilse aynen döndürür."""
+    if not isinstance(values, (list, tuple, np.ndarray)) or len(values) < MIN_LENGTH:
+        return values
+    try:
+        array = np.asarray(values)
+    except ValueError:      # düzensiz iç içe listeler
+        return values
+    if array.dtype.kind not in "iuf" or array.ndim > 2:
+        return values
+    array = _narrow(array, money)
+    spec = {"dtype": TYPED_DTYPES[array.dtype.name],
+            "bdata": base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")}
+    if array.ndim == 2:
+        spec["shape"] = f"{array.shape[0]},{array.shape[1]}"
+    return spec
+
+
+def encode_trace(trace):
+    """Trace sözlüğündeki sayısal dizileri (marker gibi iç sözlükler dahil) tipli diziye çevirir."""
+    encoded = {}
+    for key, value in trace.items():
+        if isinstance(value, dict):
+            encoded[key] = encode_trace(value)
+        else:
+            encoded[key] = typed_array(value, money=key in MONEY_FIELDS)
+    return encoded
+
+
+def encode_figure(figure):
+    """Figürün trace dizilerini tipli diziye çevirir."""
+    # Sadece trace verisi kodlanır; layout dizileri küçük ve okunabilir kalır
+    return {**figure, "data": [encode_trace(trace) for trace in figure.get("data", [])]}
+
+
+def payload_size(figure):
+    """Figürün tarayıcıya giden JSON boyutu (bayt)."""
+    return len(to_json_plotly(figure).encode("utf-8"))
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+
+def sorted_dates(frame):
+    """Tarih'e göre sıralı bir çerçevenin tarih dizisini (datetime64) döndürür."""
+    return frame["Tarih"].to_numpy(dtype="datetime64[ns]")
+
+
+def date_range_bounds(dates, start=None, end=None):
+    # İkili arama ile [start, end] aralığının satır sınırları; end dahil
+    lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start), "ns"), side="left"))
+    hi = len(dates) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end), "ns"), side="right"))
+    return lo, max(lo, hi)
+
+
+class CategoryIndex:
+    """Kategorik bir sütun için değer -> satır pozisyonları (artan sıralı) indeksi.
+
+    Çoklu seçim filtreleri string karşılaştırması yerine pozisyon kümelerinin
+    birleşimi/kesişimi olarak çözülür.
+    """
+
+    def __init__(self, values):
+        values = values.astype("category")
+        codes = values.cat.codes.to_numpy()
+        order = np.argsort(codes, kind="stable")   # her kod içinde pozisyonlar artan kalır
+        n_missing = int((codes < 0).sum())
+        self._positions = order[n_missing:]
+        counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._codes = {value: code for code, value in enumerate(values.cat.categories)}
+
+    def positions(self, selected, lo=0, hi=None):
+        # Seçili değerlerin [lo, hi) aralığına düşen pozisyonlarının birleşimi
+        parts = []
+        for value in selected:
+            code = self._codes.get(value)
+            if code is None:
+                continue
+            pos = self._positions[self._offsets[code]:self._offsets[code + 1]]
+            start = np.searchsorted(pos, lo, side="left")
+            stop = len(pos) if hi is None else np.searchsorted(pos, hi, side="left")
+            parts.append(pos[start:stop])
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        # Değerler ayrık kümeler olduğundan birleşim = sıralı birleştirme
+        return np.sort(np.concatenate(parts), kind="stable")
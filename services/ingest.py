@@ -0,0 +1,157 @@
+import base64
+import io
+from dataclasses import dataclass
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from services.loader import SCHEMA, CATEGORICAL, SchemaError, canonical_column, coerce, mark_clean, text_dtypes
+
+# 4'ün katı: base64 parçaları birbirinden bağımsız çözülebilir
+B64_CHUNK_CHARS = 4 * 256 * 1024
+CHUNK_ROWS = 50_000
+
+
+class IngestError(SchemaError):
+    pass
+
+
+@dataclass
+class IngestResult:
+    frame: pd.DataFrame
+    rows_accepted: int
+    rows_rejected: int
+    bytes_read: int
+    # DataFrame boyutlarından tahmin: tutulan parçalar + işlenen parça + birleştirme.
+    # Base64/CSV çözme tamponları ve parser'ın geçici bellekleri dahil değildir.
+    peak_frame_bytes: int
+
+
+def iter_base64_chunks(contents, chunk_chars=B64_CHUNK_CHARS):
+    """dcc.Upload 'data:...;base64,XXXX' içeriğini parça parça çözerek bayt olarak üretir."""
+    start = contents.index(",") + 1
+    for pos in range(start, len(contents), chunk_chars):
+        yield base64.b64decode(contents[pos:pos + chunk_chars])
+
+
+class Base64Stream(io.RawIOBase):
+    """Base64 metnini tamamını çözmeden okunabilir ikili akış olarak sunar."""
+
+    def __init__(self, contents, chunk_chars=B64_CHUNK_CHARS):
+        self._chunks = iter_base64_chunks(contents, chunk_chars)
+        self._buffer = b""
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buffer = memoryview(chunk)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        self.bytes_read += n
+        return n
+
+
+def _concat_chunks(chunks):
+    if not chunks:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in SCHEMA.items()})
+    # Parçaların kategorileri farklı olabilir: kategorik sütunlar union_categoricals ile birleşir
+    columns = {}
+    for col in chunks[0].columns:
+        parts = [c[col] for c in chunks]
+        if col in CATEGORICAL:
+            columns[col] = union_categoricals(parts, sort_categories=True)
+        else:
+            columns[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def decoded_size(contents):
+    # Base64 metninden çözülmüş bayt sayısının tahmini (ilerleme yüzdesi için)
+    return (len(contents) - contents.index(",") - 1) * 3 // 4
+
+
+def _ingest_chunks(reader, stream_bytes, total_bytes, progress=None):
+    kept, kept_bytes, peak = [], 0, 0
+    accepted = rejected = 0
+    for raw in reader:
+        raw_bytes = int(raw.memory_usage(deep=True).sum())
+        # Şema doğrulama ve tip dönüşümü parça başına services.loader'da
+        chunk, bad = coerce(raw)
+        rejected += bad
+        accepted += len(chunk)
+        peak = max(peak, kept_bytes + raw_bytes)
+        kept.append(chunk)
+        kept_bytes += int(chunk.memory_usage(deep=True).sum())
+        if progress is not None:
+            progress(stream_bytes(), total_bytes, accepted, rejected)
+    frame = mark_clean(_concat_chunks(kept))
+    # pd.concat sırasında parçalar ve sonuç aynı anda bellekte
+    peak = max(peak, kept_bytes + int(frame.memory_usage(deep=True).sum()))
+    return IngestResult(frame, accepted, rejected, stream_bytes(), peak)
+
+
+def _peek_header(buffered):
+    # Başlık satırı akıştan tüketilmeden tampondan okunur (dtype eşlemesi dosyadaki adlarla kurulur)
+    head = buffered.peek(64 * 1024)
+    line = head.split(b"\n", 1)[0]
+    return pd.read_csv(io.BytesIO(line), encoding="utf-8-sig", nrows=0).columns if line.strip() else []
+
+
+def ingest_csv(contents, chunk_rows=CHUNK_ROWS, progress=None):
+    stream = Base64Stream(contents)
+    buffered = io.BufferedReader(stream, buffer_size=1024 * 1024)
+    reader = pd.read_csv(
+        buffered,
+        encoding="utf-8-sig",
+        usecols=lambda col: canonical_column(col) is not None,
+        dtype=text_dtypes(_peek_header(buffered)),
+        chunksize=chunk_rows,
+    )
+    with reader:
+        return _ingest_chunks(reader, lambda: stream.bytes_read, decoded_size(contents), progress)
+
+
+def ingest_xlsx(contents, chunk_rows=CHUNK_ROWS, progress=None):
+    from openpyxl import load_workbook
+
+    # XLSX bir zip arşivi: rastgele erişim için çözülmüş bayt bir kez bellekte tutulur,
+    # satırlar ise read_only modda parça parça okunur
+    data = io.BytesIO(b"".join(iter_base64_chunks(contents)))
+    workbook = load_workbook(data, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(col).strip() if col is not None else "" for col in next(rows, ())]
+        keep = [i for i, col in enumerate(header) if canonical_column(col) is not None]
+        columns = [header[i] for i in keep]
+
+        def reader():
+            batch = []
+            for row in rows:
+                batch.append([row[i] if i < len(row) else None for i in keep])
+                if len(batch) >= chunk_rows:
+                    yield pd.DataFrame(batch, columns=columns)
+                    batch = []
+            if batch or not columns:
+                yield pd.DataFrame(batch, columns=columns)
+
+        # Zip içindeki okuma konumu bilinmediğinden ilerleme satır sayısıyla raporlanır
+        size = data.getbuffer().nbytes
+        return _ingest_chunks(reader(), lambda: size, size, progress)
+    finally:
+        workbook.close()
+
+
+def ingest_upload(contents, extension, progress=None):
+    """progress(bytes_read, total_bytes, rows_accepted, rows_rejected) her parçadan sonra çağrılır."""
+    if extension == ".csv":
+        return ingest_csv(contents, progress=progress)
+    if extension == ".xlsx":
+        return ingest_xlsx(contents, progress=progress)
+    raise IngestError("Sadece CSV veya Excel dosyası yükleyebilirsiniz!")
@@ -0,0 +1,123 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Kanonik şema: sütun -> bellek içi tip. Satır başına bellek için kompakt tipler:
+# Stok float32 (2^24'e kadar tam sayılar birebir, eksik değer NaN), metinler kategorik.
+# Tutarlar float64 kalır: float32 kuruşu ancak 2^17 ≈ 131.072 ₺'ye kadar tutar
+# (200000.01 -> 200000.015625), Mikro satır tutarları bu sınırı aşabilir.
+# Toplamlar küpte float64 ile hesaplanır (services.cube).
+SCHEMA = {
+    "Tarih": "datetime64[ns]",
+    "Müşteri": "category",
+    "Segment": "category",
+    "Satış": "float64",
+    "Tahsilat": "float64",
+    "Gider": "float64",
+    "Stok": "float32",
+}
+REQUIRED = ["Tarih", "Satış", "Tahsilat", "Gider"]
+NUMERIC = ["Satış", "Tahsilat", "Gider", "Stok"]
+CATEGORICAL = ["Müşteri", "Segment"]
+UNKNOWN_SEGMENT = "Bilinmiyor"
+
+CLEAN_FLAG = "clean"
+# Parse davranışı değişince artırılır: önbellekteki eski sonuçlar yeniden kullanılmaz
+PARSER_VERSION = 2
+
+# Türkçe büyük/küçük harf ve aksan farkları: "SATIŞ", "satis", " Müşteri " aynı sütun sayılır
+_TURKISH_LOWER = str.maketrans({"İ": "i", "I": "ı"})
+_ASCII_FOLD = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c"})
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def fold_text(name):
+    """Türkçe duyarlı küçük harf + aksansız karşılaştırma anahtarı ("İŞ Ortağı" -> "is ortagi")."""
+    name = unicodedata.normalize("NFC", str(name)).strip().translate(_TURKISH_LOWER).lower()
+    return " ".join(name.translate(_ASCII_FOLD).split())
+
+
+_CANONICAL = {fold_text(col): col for col in SCHEMA}
+
+
+def canonical_column(name):
+    """Dosyadaki sütun adının şemadaki karşılığı; şemada yoksa None."""
+    return _CANONICAL.get(fold_text(name))
+
+
+def normalize_columns(df):
+    # Aynı sütuna eşlenen birden fazla başlık varsa ilki kullanılır
+    renames, seen = {}, set()
+    for col in df.columns:
+        canonical = canonical_column(col)
+        if canonical is not None and canonical not in seen:
+            renames[col] = canonical
+            seen.add(canonical)
+    return df[list(renames)].rename(columns=renames)
+
+
+def coerce(df):
+    """Şemayı doğrular ve tipleri ayarlar; (temiz çerçeve, reddedilen satır sayısı) döndürür.
+
+    Zorunlu sütunlardan biri boş ya da çevrilemeyen satırlar atılır.
+    """
+    df = normalize_columns(df)
+    missing = [col for col in REQUIRED if col not in df.columns]
+    if "Tarih" in missing:
+        raise SchemaError("Dosyada 'Tarih' sütunu eksik!")
+    if missing:
+        raise SchemaError(f"Dosyada {', '.join(missing)} sütun(lar)ı eksik!")
+
+    columns = {"Tarih": pd.to_datetime(df["Tarih"], errors="coerce")}
+    for col in NUMERIC:
+        values = pd.to_numeric(df[col], errors="coerce") if col in df.columns else np.nan
+        columns[col] = pd.Series(values, index=df.index, dtype=SCHEMA[col])
+    customers = df["Müşteri"] if "Müşteri" in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+    columns["Müşteri"] = customers.astype("category")
+    segments = df["Segment"] if "Segment" in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+    segments = segments.astype("string").str.strip().fillna(UNKNOWN_SEGMENT)
+    columns["Segment"] = segments.astype(object).astype("category")
+
+    frame = pd.DataFrame(columns)[list(SCHEMA)]
+    valid = frame[REQUIRED].notna().all(axis=1)
+    return frame[valid], int((~valid).sum())
+
+
+def mark_clean(df):
+    df.attrs[CLEAN_FLAG] = True
+    return df
+
+
+def is_clean(df):
+    # attrs dilimleme, concat ve Feather önbelleği üzerinden korunur
+    return bool(df.attrs.get(CLEAN_FLAG))
+
+
+def clean(df):
+    """Çerçeveyi şemaya getirir; zaten temiz işaretliyse dokunmadan döndürür."""
+    if is_clean(df):
+        return df
+    frame, _ = coerce(df)
+    return mark_clean(frame.reset_index(drop=True))
+
+
+def text_dtypes(header):
+    """Dosyadaki başlık adlarıyla read_csv dtype eşlemesi: kategorik sütunlar metin okunur.
+
+    Başlık varyantları ("MÜŞTERİ", "musteri") şemadaki adla eşleştiği için eşleme
+    dosyanın kendi başlıklarından kurulur; "007" gibi kodlar sayıya çevrilmez.
+    """
+    return {col: "str" for col in header if canonical_column(col) in CATEGORICAL}
+
+
+def load_csv(path):
+    header = pd.read_csv(path, encoding="utf-8-sig", nrows=0).columns
+    if hasattr(path, "seek"):
+        path.seek(0)
+    df = pd.read_csv(path, encoding="utf-8-sig", usecols=lambda col: canonical_column(col) is not None,
+                     dtype=text_dtypes(header))
+    return clean(df)
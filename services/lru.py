@@ -0,0 +1,43 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """İş parçacığı güvenli, girdi sayısıyla sınırlı LRU önbellek; isabet/ıskalama sayar.
+
+    Değer kilit dışında üretilir: yavaş bir üretim diğer anahtarların okunmasını
+    bekletmez. Aynı anahtar aynı anda iki kez üretilebilir; sonuç aynı olduğundan
+    sonra yazan kazanır.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._items), "max_entries": self.max_entries}
@@ -0,0 +1,202 @@
+import functools
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger("mdash.callbacks")
+
+# Toplam callback süresi histogramı (saniye)
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# O an çalışan callback'in kaydı (istek başına bir callback, worker thread'i başına bir kayıt)
+_local = threading.local()
+
+
+class _Record:
+    __slots__ = ("name", "start", "elapsed", "stages", "stack", "rows")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        self.stages = defaultdict(float)
+        self.stack = []     # [aşama, başlangıç, alt aşamalarda geçen süre]
+        self.rows = 0
+
+
+class _Stage:
+    # Aşama süreleri dışlayıcıdır: iç içe aşamada geçen süre dıştaki aşamadan düşülür
+    __slots__ = ("record", "name")
+
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.record.stack.append([self.name, time.perf_counter(), 0.0])
+
+    def __exit__(self, *exc):
+        name, start, children = self.record.stack.pop()
+        elapsed = time.perf_counter() - start
+        self.record.stages[name] += elapsed - children
+        if self.record.stack:
+            self.record.stack[-1][2] += elapsed
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name):
+    """Çalışan callback'in name aşamasını ölçer; ölçüm kapalıysa ya da callback dışında no-op."""
+    record = getattr(_local, "record", None)
+    return _NULL_STAGE if record is None else _Stage(record, name)
+
+
+def add_rows(count):
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record.rows += int(count)
+
+
+class CallbackMetrics:
+    """Dash callback'leri için aşama bazlı süre, satır ve yanıt boyutu ölçümleri.
+
+    instrument() ile sarılan callback'lerin süresi stage() aşamalarına bölünür;
+    kalan süre "diğer", Dash'in istek çözümleme ve yanıt serileştirme süresi
+    "yanıt" aşamasına yazılır. Sonuçlar Prometheus metin formatında sunulur;
+    slow_ms verilirse eşiği aşan çağrılar loglanır. Kapalıyken instrument()
+    fonksiyonu olduğu gibi döndürür ve stage() no-op'tur.
+    """
+
+    def __init__(self, enabled=False, slow_ms=None):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._calls = defaultdict(int)
+        self._stage_seconds = defaultdict(float)     # (callback, aşama) -> saniye
+        self._rows = defaultdict(int)
+        self._payload_bytes = defaultdict(int)
+        self._duration_sum = defaultdict(float)
+        self._buckets = defaultdict(lambda: [0] * len(DURATION_BUCKETS))
+
+    @classmethod
+    def from_env(cls):
+        slow_ms = os.environ.get("MDASH_SLOW_CALLBACK_MS")
+        return cls(enabled=os.environ.get("MDASH_METRICS", "0") == "1" or bool(slow_ms),
+                   slow_ms=float(slow_ms) if slow_ms else None)
+
+    def instrument(self, func):
+        if not self.enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            record = _local.record = _Record(func.__name__)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record.elapsed = time.perf_counter() - record.start
+                record.stages["diğer"] += record.elapsed - sum(record.stages.values())
+                _local.record = None
+                _local.finished = record
+        return wrapper
+
+    def install(self, server, path="/metrics", gauges=None):
+        """Flask sunucusuna istek kancalarını ve Prometheus uç noktasını ekler.
+
+        gauges: uç nokta her okunduğunda ek anlık değerleri döndüren fonksiyon.
+        """
+        if not self.enabled:
+            return
+
+        @server.before_request
+        def _start_request():
+            _local.finished = None
+            _local.request_start = time.perf_counter()
+
+        @server.after_request
+        def _finish_request(response):
+            record = getattr(_local, "finished", None)
+            if record is not None:
+                _local.finished = None
+                total = time.perf_counter() - _local.request_start
+                record.stages["yanıt"] += max(total - record.elapsed, 0.0)
+                self.observe(record, total, response.calculate_content_length() or 0)
+            return response
+
+        def _metrics_view():
+            body = self.render(gauges() if gauges else None)
+            return body, 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+        server.add_url_rule(path, "mdash_metrics", _metrics_view)
+
+    def observe(self, record, total, payload_bytes):
+        with self._lock:
+            name = record.name
+            self._calls[name] += 1
+            self._rows[name] += record.rows
+            self._payload_bytes[name] += payload_bytes
+            self._duration_sum[name] += total
+            buckets = self._buckets[name]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if total <= bound:
+                    buckets[i] += 1
+            for stage_name, seconds in record.stages.items():
+                self._stage_seconds[(name, stage_name)] += seconds
+        if self.slow_ms is not None and total * 1000 >= self.slow_ms:
+            stages = ", ".join(f"{s}={v * 1000:.0f}ms" for s, v in
+                               sorted(record.stages.items(), key=lambda item: -item[1]))
+            logger.warning("Yavaş callback %s: %.0f ms (%s) · %d satır · %d bayt",
+                           record.name, total * 1000, stages, record.rows, payload_bytes)
+
+    def render(self, gauges=None):
+        # gauges: {metrik adı: değer} ek anlık değerler (ör. figür önbelleği isabetleri)
+        with self._lock:
+            lines = [
+                "# HELP mdash_callback_calls_total Tamamlanan callback çağrıları",
+                "# TYPE mdash_callback_calls_total counter",
+            ]
+            lines += [f'mdash_callback_calls_total{{callback="{n}"}} {v}' for n, v in sorted(self._calls.items())]
+            lines += [
+                "# HELP mdash_callback_stage_seconds_total Callback aşamalarında geçen toplam süre",
+                "# TYPE mdash_callback_stage_seconds_total counter",
+            ]
+            lines += [f'mdash_callback_stage_seconds_total{{callback="{n}",stage="{s}"}} {v:.6f}'
+                      for (n, s), v in sorted(self._stage_seconds.items())]
+            lines += [
+                "# HELP mdash_callback_rows_total Callback'lerin işlediği küp satırları",
+                "# TYPE mdash_callback_rows_total counter",
+            ]
+            lines += [f'mdash_callback_rows_total{{callback="{n}"}} {v}' for n, v in sorted(self._rows.items())]
+            lines += [
+                "# HELP mdash_callback_payload_bytes_total Callback yanıtlarının toplam boyutu",
+                "# TYPE mdash_callback_payload_bytes_total counter",
+            ]
+            lines += [f'mdash_callback_payload_bytes_total{{callback="{n}"}} {v}'
+                      for n, v in sorted(self._payload_bytes.items())]
+            lines += [
+                "# HELP mdash_callback_duration_seconds İstek başına toplam callback süresi",
+                "# TYPE mdash_callback_duration_seconds histogram",
+            ]
+            for name in sorted(self._calls):
+                for bound, count in zip(DURATION_BUCKETS, self._buckets[name]):
+                    lines.append(f'mdash_callback_duration_seconds_bucket{{callback="{name}",le="{bound}"}} {count}')
+                lines.append(f'mdash_callback_duration_seconds_bucket{{callback="{name}",le="+Inf"}} {self._calls[name]}')
+                lines.append(f'mdash_callback_duration_seconds_sum{{callback="{name}"}} {self._duration_sum[name]:.6f}')
+                lines.append(f'mdash_callback_duration_seconds_count{{callback="{name}"}} {self._calls[name]}')
+        for name, value in (gauges or {}).items():
+            lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class DatasetProfile:
+    """Veri setinin satırlara dokunmadan okunabilen özeti; kayıt sırasında bir kez hesaplanır.
+
+    Tarih sınırları, filtre seçenekleri (sıralı tekil Segment/Müşteri), satır sayıları,
+    sütun bazlı boş değer sayıları ve içerik parmak izi. Küçük bir JSON olarak veri
+    setinin yanında saklanır.
+    """
+    rows: int
+    cube_rows: int
+    start_date: date = None
+    end_date: date = None
+    segments: tuple = ()
+    customers: tuple = ()
+    null_counts: dict = field(default_factory=dict)
+    fingerprint: str = None
+
+    @classmethod
+    def from_dataset(cls, frame, cube, fingerprint):
+        # Satırlar Tarih'e göre sıralı: sınırlar ilk ve son satırdır
+        dates = frame["Tarih"]
+        return cls(
+            rows=len(frame),
+            cube_rows=len(cube),
+            start_date=dates.iloc[0].date() if len(dates) else None,
+            end_date=dates.iloc[-1].date() if len(dates) else None,
+            segments=_distinct(cube["Segment"]),
+            customers=_distinct(cube["Müşteri"]),
+            null_counts={col: int(n) for col, n in frame.isna().sum().items()},
+            fingerprint=fingerprint,
+        )
+
+    @property
+    def empty(self):
+        return self.rows == 0
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "cube_rows": self.cube_rows,
+            "start_date": self.start_date.isoformat() if self.start_date else None,
+            "end_date": self.end_date.isoformat() if self.end_date else None,
+            "segments": list(self.segments),
+            "customers": list(self.customers),
+            "null_counts": self.null_counts,
+            "fingerprint": self.fingerprint,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            rows=data["rows"],
+            cube_rows=data["cube_rows"],
+            start_date=date.fromisoformat(data["start_date"]) if data["start_date"] else None,
+            end_date=date.fromisoformat(data["end_date"]) if data["end_date"] else None,
+            segments=tuple(data["segments"]),
+            customers=tuple(data["customers"]),
+            null_counts=data["null_counts"],
+            fingerprint=data["fingerprint"],
+        )
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def _distinct(values):
+    # Küpte gerçekten geçen kategoriler (ekleme sonrası kullanılmayan kategoriler elenir)
+    values = values.astype("category")
+    used = pd.unique(values.cat.codes.to_numpy())
+    return tuple(sorted(str(values.cat.categories[code]) for code in used if code >= 0))
@@ -0,0 +1,185 @@
+import os
+import pickle
+import secrets
+import threading
+from collections import OrderedDict
+
+from services.columnar_cache import ColumnarCache, prune_lru
+from services.dataset import Dataset
+from services.profile import DatasetProfile
+
+
+class DatasetRegistry:
+    """Yüklenen veri setlerini (Dataset) sunucu tarafında kısa bir token ile tutar.
+
+    Bellek bütçesi aşıldığında en uzun süredir kullanılmayan (LRU) veri seti
+    bellekten atılır; spill_dir verilmişse önce diske yazılır ve tekrar
+    istendiğinde oradan geri yüklenir. Spill dosyaları Feather (Arrow IPC)
+    olarak yazılır ve belleğe eşlenerek okunur: aynı token'ı açan worker'lar
+    satırları ve küpü yeniden parse etmeden, sayfa önbelleğini paylaşarak kullanır.
+    pyarrow yoksa pickle'a düşülür. Veri setinin profili (tarih sınırları, filtre
+    seçenekleri) yanına küçük bir JSON olarak yazılır; profile() satırları yüklemez.
+
+    Disk yazımları ve okumaları kilit dışında yapılır; büyük bir yükleme diğer
+    istekleri bekletmez. max_spill_bytes verilirse spill dizini her yazımdan sonra
+    bu boyuta indirilir: en uzun süredir okunmayan token'ların dosyaları silinir
+    (bellekte tutulanlar hariç).
+    """
+
+    def __init__(self, max_bytes=512 * 1024 * 1024, spill_dir=None, max_spill_bytes=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self._items = OrderedDict()   # token -> (dataset, nbytes)
+        self._spilling = {}           # bellekten atılmış, diske yazımı süren: token -> dataset
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._arrow = ColumnarCache(spill_dir)
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, default_spill_dir=None):
+        max_mb = int(os.environ.get("MDASH_REGISTRY_MB", "512"))
+        spill_dir = os.environ.get("MDASH_SPILL_DIR") or default_spill_dir
+        spill_mb = int(os.environ.get("MDASH_SPILL_MB", "2048"))
+        return cls(max_bytes=max_mb * 1024 * 1024, spill_dir=spill_dir,
+                   max_spill_bytes=spill_mb * 1024 * 1024)
+
+    def put(self, dataset, persist=False):
+        # persist: veri setini hemen spill dizinine de yaz; başka süreçler
+        # (arka plan işleri, diğer worker'lar) token ile diskten okuyabilir
+        token = secrets.token_urlsafe(8)
+        with self._lock:
+            evicted = self._insert(token, dataset)
+        if persist:
+            self._spill(token, dataset)
+            self._prune_spill(token)
+        self._spill_evicted(evicted)
+        return token
+
+    def get(self, token):
+        if not token:
+            return None
+        with self._lock:
+            dataset = self._cached(token)
+        if dataset is not None:
+            return dataset
+        dataset = self._load_spilled(token)
+        if dataset is None:
+            return None
+        with self._lock:
+            # Disk okunurken başka bir istek aynı token'ı yüklemiş olabilir
+            current = self._cached(token)
+            if current is not None:
+                return current
+            evicted = self._insert(token, dataset)
+        self._spill_evicted(evicted)
+        return dataset
+
+    def profile(self, token):
+        """Token'ın DatasetProfile'ı; bellekte değilse satırlar yerine sadece profil JSON'u okunur."""
+        if not token:
+            return None
+        with self._lock:
+            dataset = self._cached(token)
+        if dataset is not None:
+            return dataset.profile
+        path = self._profile_path(token)
+        return DatasetProfile.load(path) if path else None
+
+    def _cached(self, token):
+        # Kilit altında çağrılır
+        item = self._items.get(token)
+        if item is not None:
+            self._items.move_to_end(token)
+            return item[0]
+        return self._spilling.get(token)
+
+    def _insert(self, token, dataset):
+        # Kilit altında çağrılır; bellekten atılan [(token, dataset)] listesini döndürür,
+        # diske yazım çağıranın sorumluluğunda ve kilit dışında yapılır
+        nbytes = dataset.nbytes
+        self._items[token] = (dataset, nbytes)
+        self._total_bytes += nbytes
+        evicted = []
+        # Bütçe aşılırsa en eski veri setlerini at (yeni eklenen her zaman kalır)
+        while self._total_bytes > self.max_bytes and len(self._items) > 1:
+            old_token, (old_dataset, old_bytes) = self._items.popitem(last=False)
+            self._total_bytes -= old_bytes
+            self._spilling[old_token] = old_dataset
+            evicted.append((old_token, old_dataset))
+        return evicted
+
+    def _spill_evicted(self, evicted):
+        for token, dataset in evicted:
+            try:
+                self._spill(token, dataset)
+            finally:
+                # Yazım bitene kadar get() veri setini _spilling'den döndürür
+                with self._lock:
+                    self._spilling.pop(token, None)
+            self._prune_spill(token)
+
+    def _prune_spill(self, written_token):
+        if not self.spill_dir or self.max_spill_bytes is None:
+            return
+        with self._lock:
+            keep = set(self._items) | set(self._spilling) | {written_token}
+        # Bir token'ın tüm dosyaları ({token}.frame.feather, .cube.feather, .profile.json) birlikte silinir
+        prune_lru(self.spill_dir, self.max_spill_bytes,
+                  group_of=lambda name: name.split(".", 1)[0], keep=keep)
+
+    def _spill_path(self, token):
+        if not self.spill_dir:
+            return None
+        # Token'lar token_urlsafe ile üretildiği için dosya adı olarak güvenli;
+        # dışarıdan gelen değerlerde dizin geçişini yine de engelle
+        if os.path.basename(token) != token:
+            return None
+        return os.path.join(self.spill_dir, f"{token}.pkl")
+
+    def _profile_path(self, token):
+        path = self._spill_path(token)
+        return None if path is None else os.path.join(self.spill_dir, f"{token}.profile.json")
+
+    def _spill(self, token, dataset):
+        path = self._spill_path(token)
+        if path is None:
+            return
+        profile_path = self._profile_path(token)
+        if not os.path.exists(profile_path):
+            dataset.profile.save(profile_path)
+        if self._arrow.enabled:
+            # Küp en son yazılır: küp dosyası varsa veri seti eksiksizdir
+            if not self._arrow.contains(f"{token}.cube"):
+                self._arrow.store(f"{token}.frame", dataset.frame)
+                self._arrow.store(f"{token}.cube", dataset.cube, fingerprint=dataset.fingerprint)
+            return
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(dataset, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _load_spilled(self, token):
+        path = self._spill_path(token)
+        if path is None:
+            return None
+        if self._arrow.enabled:
+            cube = self._arrow.load(f"{token}.cube")
+            frame = self._arrow.load(f"{token}.frame") if cube is not None else None
+            if frame is None:
+                return None
+            # Tarih/kategori indeksleri eşlenmiş küpten yeniden kurulur (parse yok);
+            # profil kayıtlı JSON'dan gelir, satırlar yeniden taranmaz
+            return Dataset(frame=frame, cube=cube, fingerprint=cube.attrs.get("fingerprint"),
+                           profile=DatasetProfile.load(self._profile_path(token)))
+        try:
+            with open(path, "rb") as f:
+                dataset = pickle.load(f)
+            os.utime(path)       # LRU temizliği için son kullanım
+        except OSError:          # hiç yazılmamış ya da temizlenmiş
+            return None
+        return dataset
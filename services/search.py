@@ -0,0 +1,73 @@
+import bisect
+from collections import defaultdict
+
+import numpy as np
+
+from services.loader import fold_text
+
+# Alt dizi araması 3'lü harf gruplarıyla (trigram) daraltılır; daha kısa sorgular önek araması
+NGRAM = 3
+
+
+def search_option(label):
+    # Dropdown gelen seçenekleri tarayıcıda yazılan metinle yeniden süzer; varsayılan olarak
+    # label'a bakar ve "isik" yazınca "Işık"ı eler. search anahtarı katlanmış biçimi de içerir.
+    return {"label": label, "value": label, "search": f"{label} {fold_text(label)}"}
+
+
+class SearchIndex:
+    """Sıralı etiket listesi için önek + alt dizi arama indeksi (Türkçe duyarlı katlama).
+
+    Etiketler fold_text ile katlanır ("İSTANBUL", "istanbul", "Istanbul" aynı eşleşir).
+    Önek eşleşmeleri katlanmış sıralı listede ikili aramayla, alt dizi eşleşmeleri
+    trigram -> etiket pozisyonları listelerinin kesişimiyle bulunur; tam liste taranmaz.
+    """
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        folded = [fold_text(label) for label in self.labels]
+        self._order = sorted(range(len(folded)), key=folded.__getitem__)
+        self._sorted_keys = [folded[i] for i in self._order]
+        self._folded = folded
+        postings = defaultdict(list)
+        for position, key in enumerate(folded):
+            for gram in {key[i:i + NGRAM] for i in range(len(key) - NGRAM + 1)}:
+                postings[gram].append(position)
+        self._postings = {gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _prefix(self, key, limit):
+        start = bisect.bisect_left(self._sorted_keys, key)
+        found = []
+        for i in range(start, len(self._sorted_keys)):
+            if len(found) >= limit or not self._sorted_keys[i].startswith(key):
+                break
+            found.append(self._order[i])
+        return sorted(found)
+
+    def _substring(self, key):
+        grams = {key[i:i + NGRAM] for i in range(len(key) - NGRAM + 1)}
+        # En seyrek trigram'dan başlanır; kesişim boşalınca durulur
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            positions = self._postings.get(gram)
+            if positions is None:
+                return []
+            candidates = positions if candidates is None else np.intersect1d(candidates, positions, assume_unique=True)
+            if not len(candidates):
+                return []
+        # Trigram'ların hepsini içermek sıralı geçişi garanti etmez: adaylar doğrulanır
+        return [int(i) for i in candidates if key in self._folded[i]]
+
+    def search(self, query, limit=50):
+        """query ile eşleşen en fazla limit etiket: önce önek, sonra alt dizi eşleşmeleri."""
+        key = fold_text(query or "")
+        if not key:
+            return self.labels[:limit]
+        found = self._prefix(key, limit)
+        if len(found) < limit and len(key) >= NGRAM:
+            seen = set(found)
+            found += [i for i in self._substring(key) if i not in seen][:limit - len(found)]
+        return [self.labels[i] for i in found]
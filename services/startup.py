@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+
+class StartupProfile:
+    """Uygulama açılışının aşama aşama süresini ölçer (MDASH_PROFILE_STARTUP=1).
+
+    mark() her çağrıldığında bir önceki işaretten bu yana geçen süre o aşamaya
+    yazılır; report() toplamla birlikte stderr'e basar. Kapalıyken hiçbir şey yapmaz.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = []
+        self._start = self._last = time.perf_counter()
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=os.environ.get("MDASH_PROFILE_STARTUP", "0") == "1")
+
+    def mark(self, stage):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        total = self._last - self._start
+        lines = [f"⏱ Açılış profili (pid {os.getpid()}):"]
+        for stage, seconds in self.stages:
+            share = 100 * seconds / total if total else 0
+            lines.append(f"   {stage:32s} {seconds * 1000:8.1f} ms  %{share:4.1f}")
+        lines.append(f"   {'toplam':32s} {total * 1000:8.1f} ms")
+        print("\n".join(lines), file=sys.stderr)
@@ -0,0 +1,63 @@
+"""Dashboard callback'lerinin tepe bellek tahsisi için regresyon testi.
+
+Her callback'in sunucuda yaptığı iş (filtreli küp + builder + to_dict + figür
+kodlaması) tracemalloc altında ölçülür ve bütçeyle karşılaştırılır. Builder'lar
+copy-on-write açık ve kapalıyken SettingWithCopyWarning üretmemelidir.
+"""
+import tracemalloc
+import warnings
+
+import pandas as pd
+import pytest
+from pandas.errors import SettingWithCopyWarning
+
+from components.charts import (
+    sales_trend_chart,
+    top_stock_chart,
+    cash_vs_expense_pie,
+    segment_scatter,
+    profit_scatter,
+    sales_year_comparison_chart,
+)
+from components.kpi_cards import generate_kpi_cards
+from otomatikveritabanıolustur import generate
+from services.dataset import Dataset
+from services.figure_encoding import encode_figure
+
+ROWS = 200_000
+CUSTOMERS = 5_000
+BUDGET_MB = 32
+
+BUILDERS = [sales_trend_chart, top_stock_chart, cash_vs_expense_pie, segment_scatter,
+            profit_scatter, sales_year_comparison_chart]
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return Dataset.from_frame(generate(rows=ROWS, customers=CUSTOMERS, seed=42))
+
+
+def run_callback(dataset, builder):
+    cube = dataset.filter_cube(pd.Timestamp("2023-01-01"), pd.Timestamp("2025-12-31"), ["A", "B", "C"])
+    if builder is generate_kpi_cards:
+        return builder(cube)
+    return encode_figure(builder(cube).to_dict())
+
+
+def peak_mb(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("copy_on_write", [True, False])
+@pytest.mark.parametrize("builder", BUILDERS + [generate_kpi_cards], ids=lambda b: getattr(b, "__name__", b))
+def test_callback_peak_memory(dataset, builder, copy_on_write):
+    with pd.option_context("mode.copy_on_write", copy_on_write), warnings.catch_warnings():
+        warnings.simplefilter("error", SettingWithCopyWarning)
+        run_callback(dataset, builder)   # ilk çağrı: plotly şablon/doğrulayıcı yüklemeleri ölçüme girmesin
+        peak = peak_mb(run_callback, dataset, builder)
+    assert peak <= BUDGET_MB, f"{builder.__name__}: {peak:.1f} MB > {BUDGET_MB} MB"
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.cube import CUBE_MEASURES, build_cube, rollup
+from services.dataset import Dataset
+
+
+def make_rows(rows=20_000, customers=500, seed=42):
+    # Kuruşlu tutarlar; bir kısmı float32'nin kuruş sınırının (2^17 ₺) üstünde
+    rng = np.random.default_rng(seed)
+    sales = (rng.lognormal(9, 1.5, rows) * 100).round() / 100
+    return pd.DataFrame({
+        "Tarih": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 4 * 365, rows), "D"),
+        "Müşteri": [f"Müşteri_{i}" for i in rng.integers(0, customers, rows)],
+        "Segment": rng.choice(["A", "B", "C", "D"], rows),
+        "Satış": sales,
+        "Tahsilat": (sales * rng.uniform(0.6, 1.0, rows)).round(2),
+        "Gider": (sales * rng.uniform(0.5, 1.0, rows)).round(2),
+        "Stok": rng.integers(0, 5000, rows).astype("float64"),
+    })
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return make_rows()
+
+
+@pytest.mark.parametrize("by", ["Segment", "Müşteri", "Ay"])
+def test_compact_totals_match_float64(rows, by):
+    # Referans: aynı satırlar float64/object tiplerle (kategorik anahtarlar küp için gerekli)
+    wide = rows.sort_values("Tarih", kind="stable").assign(
+        Müşteri=lambda d: d["Müşteri"].astype("category"),
+        Segment=lambda d: d["Segment"].astype("category"),
+    )
+    expected = rollup(build_cube(wide), by)[CUBE_MEASURES]
+    actual = rollup(Dataset.from_frame(rows).cube, by)[CUBE_MEASURES]
+    # Fark ölçünün en büyük mutlak toplamına göre: Kâr gibi sıfıra yakın hücrelerde göreli fark anlamsız
+    scale = expected.abs().max().replace(0, 1)
+    assert ((actual - expected).abs().max() / scale).max() <= 1e-9
+
+
+def test_money_keeps_kurus_above_float32_limit():
+    frame = make_rows(rows=3)
+    frame["Satış"] = [200000.01, 1599999.99, 131072.03]
+    stored = Dataset.from_frame(frame).frame["Satış"]
+    assert sorted(stored) == sorted([200000.01, 1599999.99, 131072.03])
+
+
+def test_compact_rows_are_smaller(rows):
+    dataset = Dataset.from_frame(rows)
+    assert dataset.frame["Müşteri"].dtype.name == "category"
+    assert dataset.frame["Stok"].dtype == np.float32
+    assert dataset.frame.memory_usage(deep=True).sum() < rows.memory_usage(deep=True).sum() / 2
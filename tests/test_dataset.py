@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.cube import CUBE_KEYS, ROW_COUNT, build_cube
+from services.dataset import Dataset
+
+
+def make_rows(dates, customers, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(dates)
+    return pd.DataFrame({
+        "Tarih": pd.to_datetime(dates),
+        "Müşteri": rng.choice(customers, n),
+        "Segment": rng.choice(list("ABC"), n),
+        "Satış": rng.integers(-100, 1000, n).astype(float),
+        "Tahsilat": (rng.random(n) * 900).round(2),
+        "Gider": (rng.random(n) * 800).round(2),
+        "Stok": rng.integers(0, 50, n),
+    })
+
+
+def rng_dates(start, end, n, seed):
+    return np.random.default_rng(seed).choice(pd.date_range(start, end), n)
+
+
+def comparable(cube):
+    # Kategori kümeleri farklı olabilir: anahtarlar metin olarak sıralanıp karşılaştırılır
+    cube = cube.astype({"Müşteri": object, "Segment": object})
+    return cube.sort_values(CUBE_KEYS, ignore_index=True)[sorted(cube.columns)]
+
+
+BASE = make_rows(rng_dates("2023-01-01", "2023-12-31", 3000, 1), [f"M{i}" for i in range(40)], seed=1)
+NEW_CUSTOMERS = [f"M{i}" for i in range(30)] + ["N1", "N2"]
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2024-01-01", "2024-01-31"),   # sona ekleme
+    ("2023-11-15", "2024-01-31"),   # mevcut dönemle çakışan pencere
+])
+def test_appended_cube_matches_rebuilt_cube(start, end):
+    base = Dataset.from_frame(BASE)
+    delta = make_rows(rng_dates(start, end, 400, 2), NEW_CUSTOMERS, seed=2)
+    merged, _, _ = base.append(Dataset.from_frame(delta))
+
+    assert merged.frame["Tarih"].is_monotonic_increasing
+    # Delta'nın anahtarlarını taşıyan mevcut satırlar atılır, delta tekrarsız eklenir
+    keys = pd.MultiIndex.from_frame(delta[["Tarih", "Müşteri"]])
+    kept = ~pd.MultiIndex.from_frame(BASE[["Tarih", "Müşteri"]]).isin(keys)
+    assert len(merged.frame) == kept.sum() + len(delta.drop_duplicates(["Tarih", "Müşteri"]))
+    pd.testing.assert_frame_equal(comparable(merged.cube), comparable(build_cube(merged.frame)),
+                                  check_dtype=False)
+
+
+def test_append_counts_replaced_and_duplicate_rows():
+    base = Dataset.from_frame(pd.DataFrame({
+        "Tarih": pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02"]),
+        "Müşteri": ["A", "B", "A"],
+        "Segment": ["X", "X", "Y"],
+        "Satış": [10.0, 20.0, 30.0], "Tahsilat": [10.0, 20.0, 30.0],
+        "Gider": [1.0, 2.0, 3.0], "Stok": [1, 2, 3],
+    }))
+    # 2024-01-01,A mevcut satırı değiştirir; 2024-01-02,B dosyada iki kez geçer
+    delta = Dataset.from_frame(pd.DataFrame({
+        "Tarih": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02"]),
+        "Müşteri": ["A", "B", "B"],
+        "Segment": ["X", "Y", "Y"],
+        "Satış": [15.0, 40.0, 50.0], "Tahsilat": [15.0, 40.0, 50.0],
+        "Gider": [1.0, 4.0, 5.0], "Stok": [1, 4, 5],
+    }))
+    merged, replaced, duplicates = base.append(delta)
+
+    assert (replaced, duplicates) == (1, 1)
+    assert len(merged.frame) == 4
+    day = merged.cube[merged.cube["Tarih"] == pd.Timestamp("2024-01-02")]
+    b_row = day[day["Müşteri"] == "B"]
+    # Dosyadaki son satır kalır; iki satır birden sayılmaz
+    assert b_row[ROW_COUNT].tolist() == [1] and b_row["Satış"].tolist() == [50.0]
+    a_row = merged.cube[(merged.cube["Tarih"] == pd.Timestamp("2024-01-01")) & (merged.cube["Müşteri"] == "A")]
+    assert a_row["Satış"].tolist() == [15.0]
+
+
+def test_append_empty_delta_is_noop():
+    base = Dataset.from_frame(BASE)
+    merged, replaced, duplicates = base.append(Dataset.from_frame(BASE.iloc[:0]))
+    assert merged is base and (replaced, duplicates) == (0, 0)
+
+
+@pytest.mark.parametrize("start, end, segments, customers", [
+    (None, None, ["A"], None),
+    ("2023-03-01", "2023-06-30", None, ["M1", "M7", "YOK"]),
+    ("2023-06-01", None, ["A", "C"], ["M1", "M2", "M3"]),
+    (None, "2023-02-01", ["B"], ["M5"]),
+])
+def test_filter_cube_matches_isin_mask(start, end, segments, customers):
+    dataset = Dataset.from_frame(BASE)
+    cube = dataset.cube
+    mask = pd.Series(True, index=cube.index)
+    if start:
+        mask &= cube["Tarih"] >= pd.Timestamp(start)
+    if end:
+        mask &= cube["Tarih"] <= pd.Timestamp(end)
+    if segments:
+        mask &= cube["Segment"].isin(segments)
+    if customers:
+        mask &= cube["Müşteri"].isin(customers)
+
+    start = pd.Timestamp(start) if start else None
+    end = pd.Timestamp(end) if end else None
+    pd.testing.assert_frame_equal(dataset.filter_cube(start, end, segments, customers), cube[mask])
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.charts import customer_profit_summary, dominant_category
+from otomatikveritabanıolustur import generate
+from services.dataset import Dataset
+
+
+def lambda_mode(df):
+    # profit_scatter'ın önceki hali: referans sonuç
+    return df.groupby("Müşteri", observed=True).agg({
+        "Segment": lambda x: x.mode().iloc[0] if not x.mode().empty else "Bilinmiyor"
+    })["Segment"]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_lambda_mode(seed):
+    rng = np.random.default_rng(seed)
+    rows = 5000
+    df = pd.DataFrame({
+        "Müşteri": pd.Categorical([f"Müşteri_{i}" for i in rng.integers(0, 400, rows)]),
+        "Segment": pd.Categorical(rng.choice(list("ABCD"), rows)),
+    })
+    expected = lambda_mode(df).astype(str).sort_index()
+    actual = dominant_category(df, "Müşteri", "Segment").astype(str).reindex(expected.index)
+    pd.testing.assert_series_equal(actual, expected, check_names=False, check_index_type=False)
+
+
+def test_ties_pick_alphabetical_first_and_skip_missing():
+    df = pd.DataFrame({
+        "Müşteri": ["X", "X", "Y", "Y", "Y", "Z"],
+        "Segment": ["B", "A", None, None, "C", None],
+    })
+    result = dominant_category(df, "Müşteri", "Segment")
+    assert result.to_dict() == {"X": "A", "Y": "C"}
+
+
+def test_cube_weight_counts_rows_not_cells():
+    # Küpte bir hücre birden fazla satırı temsil eder: ağırlık Kayıt sütunudur
+    frame = generate(rows=3000, customers=50, seed=3)
+    cube = Dataset.from_frame(frame).cube
+    expected = lambda_mode(frame).astype(str).sort_index()
+    actual = dominant_category(cube, "Müşteri", "Segment", weight="Kayıt").astype(str).reindex(expected.index)
+    pd.testing.assert_series_equal(actual, expected, check_names=False, check_index_type=False)
+    summary = customer_profit_summary(cube)
+    assert summary.set_index("Müşteri")["Segment"].astype(str).reindex(expected.index).equals(actual)
@@ -0,0 +1,82 @@
+import base64
+
+import numpy as np
+import pytest
+
+from components.charts import profit_scatter
+from otomatikveritabanıolustur import generate
+from services.dataset import Dataset
+from services.figure_encoding import MIN_LENGTH, encode_figure, encode_trace, payload_size, typed_array
+
+
+def decode(spec):
+    # Plotly.js'in yaptığı gibi: base64 baytları dtype'a göre sayılara, shape varsa matrise
+    array = np.frombuffer(base64.b64decode(spec["bdata"]), dtype=np.dtype(spec["dtype"]))
+    if "shape" in spec:
+        array = array.reshape([int(n) for n in spec["shape"].split(",")])
+    return array
+
+
+def test_money_is_rounded_to_whole_lira_as_int32():
+    values = np.linspace(-1_000_000.49, 2_000_000.49, 100)
+    spec = typed_array(values, money=True)
+    assert spec["dtype"] == "i4"
+    assert np.array_equal(decode(spec), np.round(values))
+
+
+@pytest.mark.parametrize("values", [
+    np.linspace(0, 5e9, 50),                 # int32'ye sığmaz
+    np.append(np.arange(40.0), np.nan),      # boş değer tam sayıya çevrilemez
+])
+def test_money_outside_int32_stays_float64(values):
+    spec = typed_array(values, money=True)
+    assert spec["dtype"] == "f8"
+    np.testing.assert_array_equal(decode(spec), np.round(values))
+
+
+def test_other_floats_use_float32_precision():
+    values = np.random.default_rng(0).normal(size=200)
+    spec = typed_array(values)
+    assert spec["dtype"] == "f4"
+    np.testing.assert_allclose(decode(spec), values, rtol=np.finfo(np.float32).eps)
+
+
+def test_integers_and_matrices_round_trip():
+    ints = np.arange(100, dtype=np.int64)
+    assert typed_array(ints)["dtype"] == "i4"
+    assert np.array_equal(decode(typed_array(ints)), ints)
+
+    matrix = np.arange(60.0).reshape(20, 3)
+    spec = typed_array(matrix)
+    assert spec["shape"] == "20,3"
+    assert np.array_equal(decode(spec), matrix)
+
+
+def test_short_and_non_numeric_arrays_unchanged():
+    short = list(range(MIN_LENGTH - 1))
+    labels = [f"M{i}" for i in range(100)]
+    assert typed_array(short) is short
+    assert typed_array(labels) is labels
+
+
+def test_encode_trace_handles_nested_money_fields():
+    trace = {"type": "scatter", "x": list(np.arange(50) + 0.4), "marker": {"size": list(np.arange(50) * 1.6)},
+             "name": "A"}
+    encoded = encode_trace(trace)
+    assert encoded["name"] == "A"
+    assert np.array_equal(decode(encoded["x"]), np.round(trace["x"]))
+    assert np.array_equal(decode(encoded["marker"]["size"]), np.round(trace["marker"]["size"]))
+
+
+def test_encoded_scatter_is_smaller_and_within_display_precision():
+    dataset = Dataset.from_frame(generate(rows=5000, customers=1000, seed=1))
+    fig = profit_scatter(dataset.cube)
+    fig.layout.template = None
+    plain = fig.to_dict()
+    encoded = encode_figure(plain)
+
+    assert payload_size(encoded) < payload_size(plain)
+    for original, trace in zip(plain["data"], encoded["data"]):
+        for key in ("x", "y"):
+            if isinstance(trace.get(key), dict):
+                assert np.abs(decode(trace[key]) - np.asarray(original[key], dtype=float)).max() <= 0.5
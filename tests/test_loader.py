@@ -0,0 +1,22 @@
+import base64
+import io
+
+from services.ingest import ingest_csv
+from services.loader import load_csv
+
+# Başlık varyantları + sayıya benzeyen müşteri kodu
+CSV = ("TARİH,MÜŞTERİ,segment,SATIŞ,tahsilat,Gider,Stok\n"
+       + "".join(f"2024-01-{day:02d},007,A,10,5,2,1\n" for day in range(1, 11))
+       + "2024-01-11,ABC,B,1,1,1,1\n")
+
+
+def test_load_csv_keeps_text_codes_with_header_variants():
+    df = load_csv(io.BytesIO(CSV.encode("utf-8-sig")))
+    assert list(df["Müşteri"].cat.categories) == ["007", "ABC"]
+
+
+def test_ingest_chunks_agree_on_text_codes():
+    contents = "data:text/csv;base64," + base64.b64encode(CSV.encode("utf-8")).decode()
+    result = ingest_csv(contents, chunk_rows=3)
+    assert list(result.frame["Müşteri"].cat.categories) == ["007", "ABC"]
+    assert result.rows_accepted == 11
@@ -0,0 +1,19 @@
+from services.lru import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    built = []
+
+    def build(key):
+        return lambda: built.append(key) or key.upper()
+
+    assert cache.get_or_build("a", build("a")) == "A"
+    cache.get_or_build("b", build("b"))
+    cache.get_or_build("a", build("a"))   # "a" öne geçer, "b" en eski olur
+    cache.get_or_build("c", build("c"))
+    cache.get_or_build("a", build("a"))
+    cache.get_or_build("b", build("b"))
+
+    assert built == ["a", "b", "c", "b"]
+    assert cache.stats() == {"hits": 2, "misses": 4, "size": 2, "max_entries": 2}
@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.columnar_cache import ColumnarCache
+from services.dataset import Dataset
+from services.registry import DatasetRegistry
+
+
+def make_dataset(seed, rows=2000):
+    rng = np.random.default_rng(seed)
+    return Dataset.from_frame(pd.DataFrame({
+        "Tarih": pd.to_datetime("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 365, rows)), unit="D"),
+        "Müşteri": rng.choice([f"M{i}" for i in range(50)], rows),
+        "Segment": rng.choice(list("ABC"), rows),
+        "Satış": rng.random(rows) * 1000,
+        "Tahsilat": rng.random(rows) * 900,
+        "Gider": rng.random(rows) * 800,
+        "Stok": rng.integers(0, 50, rows),
+    }))
+
+
+def spilled_tokens(spill_dir):
+    return {name.split(".", 1)[0] for name in os.listdir(spill_dir)}
+
+
+def dir_bytes(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def test_spill_dir_is_pruned_oldest_first(tmp_path):
+    dataset = make_dataset(0)
+    # Bellekte tek veri seti, diskte yaklaşık iki veri seti
+    registry = DatasetRegistry(max_bytes=dataset.nbytes, spill_dir=str(tmp_path),
+                               max_spill_bytes=int(dataset.nbytes * 2.5))
+    tokens = []
+    for seed in range(6):
+        tokens.append(registry.put(make_dataset(seed), persist=True))
+        time.sleep(0.01)   # mtime sırası belirgin olsun
+
+    on_disk = spilled_tokens(tmp_path)
+    assert tokens[-1] in on_disk and tokens[0] not in on_disk
+    assert len(on_disk) < len(tokens)
+    # Silinen token yeniden açılamaz, kalanlar diskten yüklenir
+    assert registry.get(tokens[0]) is None
+    assert registry.profile(tokens[0]) is None
+    assert registry.get(tokens[-2]).fingerprint is not None
+
+
+def test_columnar_cache_is_pruned_to_budget(tmp_path):
+    frame = make_dataset(0).frame
+    cache = ColumnarCache(str(tmp_path))
+    cache.store("probe", frame)
+    file_bytes = os.path.getsize(cache._path("probe"))
+    cache = ColumnarCache(str(tmp_path), max_bytes=int(file_bytes * 3.5))
+
+    for i in range(6):
+        cache.store(f"k{i}", frame)
+        time.sleep(0.01)
+        cache.load("k0")   # okunan dosya LRU'da öne geçer
+
+    assert dir_bytes(tmp_path) <= file_bytes * 3.5
+    assert cache.contains("k0") and cache.contains("k5")
+    assert not cache.contains("k1")
+
+
+def test_get_is_not_blocked_by_spill(tmp_path, monkeypatch):
+    registry = DatasetRegistry(spill_dir=str(tmp_path))
+    ready = make_dataset(0)
+    token = registry.put(ready)
+
+    started, release = threading.Event(), threading.Event()
+    original = registry._spill
+
+    def slow_spill(token, dataset):
+        started.set()
+        release.wait(5)
+        original(token, dataset)
+
+    monkeypatch.setattr(registry, "_spill", slow_spill)
+    writer = threading.Thread(target=registry.put, args=(make_dataset(1),), kwargs={"persist": True})
+    writer.start()
+    try:
+        assert started.wait(5)
+        # Yazım sürerken kilit serbest: get beklemeden döner
+        assert registry.get(token) is ready
+    finally:
+        release.set()
+        writer.join()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.charts import lttb_indices, sales_trend_chart, trend_granularity, TREND_AXIS_TITLES, TREND_POINT_BUDGET
+from otomatikveritabanıolustur import generate
+from services.dataset import Dataset
+
+
+def test_lttb_keeps_endpoints_and_count():
+    x = np.arange(10_000)
+    y = np.sin(x / 50.0)
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_spikes():
+    # Tek noktalık tepe ve çukur seyreltmede kaybolmamalı
+    y = np.zeros(5_000)
+    y[1234], y[3456] = 100.0, -100.0
+    idx = lttb_indices(np.arange(len(y)), y, 100)
+    assert 1234 in idx and 3456 in idx
+
+
+@pytest.mark.parametrize("n_out", [0, 2, 10, 20])
+def test_lttb_short_series_unchanged(n_out):
+    x = np.arange(10)
+    assert np.array_equal(lttb_indices(x, x * 2.0, n_out), np.arange(10))
+
+
+def test_granularity_follows_point_budget():
+    assert trend_granularity(366) == "D"
+    assert trend_granularity(4 * 365, point_budget=1500) == "D"
+    assert trend_granularity(10 * 365, point_budget=1500) == "W"
+    assert trend_granularity(40 * 365, point_budget=1500) == "MS"
+
+
+def test_long_history_is_resampled_and_downsampled():
+    cube = Dataset.from_frame(generate(rows=20_000, customers=20, start="2000-01-01", end="2025-12-31")).cube
+    # Varsayılan bütçe: 26 yıl günlük seri haftalığa çevrilir, WebGL'e geçilir
+    fig = sales_trend_chart(cube)
+    trace = fig.data[0]
+    assert len(trace.x) <= TREND_POINT_BUDGET
+    assert trace.type == "scattergl"
+    assert fig.layout.xaxis.title.text == TREND_AXIS_TITLES["W"]
+    # Küçük bütçe: aylık seri de sığmaz, LTTB ile bütçeye indirilir
+    trace = sales_trend_chart(cube, point_budget=100).data[0]
+    assert len(trace.x) == 100
+    assert pd.Timestamp(trace.x[0]) < pd.Timestamp(trace.x[-1])
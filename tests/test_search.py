@@ -0,0 +1,31 @@
+import pytest
+
+from services.loader import fold_text
+from services.search import SearchIndex, search_option
+
+LABELS = ["İstanbul Gıda", "Işık Tekstil", "ISPARTA Çelik", "Müşteri_001", "Müşteri_012", "Ankara Yapı"]
+
+# (sorgu, beklenen etiket): büyük/küçük harf ve aksan farkları eşleşmeli
+FOLDING_CASES = [("istanbul", "İstanbul Gıda"), ("IŞIK", "Işık Tekstil"), ("isik", "Işık Tekstil"),
+                 ("GIDA", "İstanbul Gıda"), ("çelik", "ISPARTA Çelik"), ("musteri_01", "Müşteri_012")]
+
+
+@pytest.mark.parametrize("query, label", FOLDING_CASES)
+def test_search_folds_turkish_text(query, label):
+    assert label in SearchIndex(LABELS).search(query)
+
+
+@pytest.mark.parametrize("query, label", FOLDING_CASES)
+def test_option_search_key_keeps_folded_matches(query, label):
+    # Dropdown sunucudan gelen seçenekleri tarayıcıda search alanıyla yeniden süzer:
+    # katlanmış sorgu search içinde geçmezse doğru sonuç ekranda elenir
+    option = search_option(label)
+    assert option["value"] == label
+    assert fold_text(query) in option["search"]
+
+
+def test_search_limit_and_empty_query():
+    index = SearchIndex(LABELS)
+    assert index.search("", limit=2) == LABELS[:2]
+    assert index.search("müşteri", limit=1) == ["Müşteri_001"]
+    assert index.search("yok") == []